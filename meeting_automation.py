@@ -1,36 +1,69 @@
 import os
+import re
 import json
+import argparse
 import base64
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from itertools import islice
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
-from exchangelib import Credentials as ExchangeCredentials, Account, DELEGATE, Configuration
-from exchangelib.protocol import BaseProtocol, NoVerifyHTTPAdapter
-from webexteamssdk import WebexTeamsAPI
-import openai
-import anthropic
-import google.generativeai as genai
-import cohere
-from transformers import AutoModelForCausalLM, AutoTokenizer
-from transformers import pipeline
-from azure.ai.ml import MLClient
-from azure.identity import DefaultAzureCredential
-import boto3
-import sagemaker
 from dotenv import load_dotenv
-import pandas as pd
-from msal import ConfidentialClientApplication
-import requests
-from typing import List, Dict, Optional
+from src.models.ai_models import (AIModel, AIModelFactory, ANTHROPIC_CACHE_HEADERS, CacheUsage, HedgedModel,
+                                  HuggingFaceModel, Prompt, output_schema, split_prompt)
+from src.services.calendar_sync import CalendarSyncEngine
+from src.services.google_clients import GoogleClientRegistry
+from src.services.summary_cache import SummaryCache
+from src.services.retry import RetryEngine, RetryPolicy
+from src.services.batch_jobs import BatchRunner, make_custom_id
+from src.services.context_packer import ContextPacker, get_token_counter, render_context
+from src.services.slack_index import SlackIndex
+from src.services.dedupe import MinHashDeduplicator, strip_quoted_history
+from src.services.retrieval import rank_items, tokenize
+from src.services.graph_batch import GraphBatchClient
+from src.services.meeting_daemon import MeetingDaemon
+from src.services.event_bus import CALENDAR_CHANGED, SLACK_MESSAGE, EventBus
+from src.services.push_ingestion import PushIngestion
+from src.config.config import Config
+from src.services.pagination import iter_google_items, iter_graph_items, iter_slack_items
 
 # Load environment variables
 load_dotenv()
 
+# AI provider name -> MeetingAutomation method that initializes it. Each
+# method imports its SDK itself, so only the selected provider is loaded.
+MODEL_PROVIDERS = {
+    'openai': '_get_openai_model',
+    'anthropic': '_get_anthropic_model',
+    'google': '_get_google_model',
+    'cohere': '_get_cohere_model',
+    'huggingface': '_get_huggingface_model',
+    'azure': '_get_azure_model',
+    'sagemaker': '_get_sagemaker_model'
+}
+
+# Summary text recorded when every attempt to generate a summary failed
+SUMMARY_FAILED = "Failed to generate summary"
+
+class ProviderModel(AIModel):
+    """Exposes a MeetingAutomation provider as an AIModel so it can be hedged"""
+
+    def __init__(self, automation, model):
+        self.automation = automation
+        self.model = model
+
+    def generate(self, prompt):
+        return self.automation._generate_summary(self.model, prompt)
+
 class MeetingAutomation:
+    # Loaded AI models (keyed by provider and configuration) and their load times, shared process-wide
+    _models = {}
+    _model_lock = threading.Lock()
+    model_load_times = {}
+    _failover_model = None
+
     def __init__(self):
         self.scopes = [
             'https://www.googleapis.com/auth/calendar.readonly',
@@ -40,65 +73,84 @@ class MeetingAutomation:
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self.slack_token = os.getenv('SLACK_BOT_TOKEN')
         self.slack_client = WebClient(token=self.slack_token)
-        self.openai.api_key = self.openai_api_key
-        self.service = self._get_calendar_service()
+        self.google_clients = GoogleClientRegistry.get_instance(self.scopes)
+        self.google_service = self._get_calendar_service()
+        self.ms_app = None
+        try:
+            self.ms_app = self._get_ms_app()
+            if self.ms_app:
+                self.ms_headers = {'Content-Type': 'application/json'}
+                self._refresh_ms_headers()
+        except Exception as e:
+            # Each Microsoft sync asks for a token again, so a transient failure here is not fatal
+            print(f"Error connecting to Microsoft Graph: {e}")
+        self.calendar_sync = CalendarSyncEngine()
+        self.retry_engine = RetryEngine()
+        # Input and cached prompt tokens reported by OpenAI, Azure and Anthropic for this instance
+        self.prompt_cache = CacheUsage()
+        self.summary_cache = None
+        if os.getenv('SUMMARY_CACHE_ENABLED', 'true').lower() == 'true':
+            self.summary_cache = SummaryCache()
+        self.deduplicator = None
+        if os.getenv('DEDUPE_ENABLED', 'true').lower() == 'true':
+            self.deduplicator = MinHashDeduplicator()
+        self.slack_index = None
+        if os.getenv('SLACK_INDEX_ENABLED', 'true').lower() == 'true':
+            self.slack_index = SlackIndex()
+        self.context_workers = int(os.getenv('CONTEXT_MAX_WORKERS', 8))
+        self.context_executor = ThreadPoolExecutor(
+            max_workers=self.context_workers,
+            thread_name_prefix='context'
+        )
 
     def _get_calendar_service(self):
-        """Authenticate and get the Google Calendar service"""
-        creds = None
-        if os.path.exists('token.json'):
-            creds = Credentials.from_authorized_user_file('token.json', self.scopes)
-        
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    'credentials.json', self.scopes)
-                creds = flow.run_local_server(port=0)
-            with open('token.json', 'w') as token:
-                token.write(creds.to_json())
+        """Get the shared Google Calendar service"""
+        return self.google_clients.get_service('calendar', 'v3')
+
+    def _get_ms_app(self):
+        """Get the MSAL client for Microsoft Graph, or None if MS credentials are not configured"""
+        config = Config().calendar_config
+        if not all([config['ms_client_id'], config['ms_client_secret'], config['ms_tenant_id']]):
+            return None
+
+        from msal import ConfidentialClientApplication
+        return ConfidentialClientApplication(
+            config['ms_client_id'],
+            authority=f"https://login.microsoftonline.com/{config['ms_tenant_id']}",
+            client_credential=config['ms_client_secret']
+        )
+
+    def _refresh_ms_headers(self):
+        """Put a current Graph access token in ms_headers
 
-        return build('calendar', 'v3', credentials=creds)
+        MSAL returns its cached token until shortly before expiry, so this is
+        cheap to call before each sync. The dict is updated in place because
+        Graph batching and push subscriptions hold on to it.
+        """
+        result = self.ms_app.acquire_token_for_client(scopes=['https://graph.microsoft.com/.default'])
+        if 'access_token' not in result:
+            raise RuntimeError(f"Failed to get Microsoft Graph token: {result.get('error_description')}")
+        self.ms_headers['Authorization'] = f"Bearer {result['access_token']}"
 
     def get_meeting_details(self, days=1, calendar_type='all'):
         """Get meeting details from all configured calendars"""
-        meetings = []
-        
+        return list(self.iter_calendar_events(days, calendar_type))
+
+    def iter_calendar_events(self, days=1, calendar_type='all'):
+        """Yield meetings from each configured calendar in turn"""
         if calendar_type in ['all', 'google']:
-            meetings.extend(self._get_google_meetings(days))
+            yield from self._get_google_meetings(days)
         
         if calendar_type in ['all', 'microsoft']:
-            meetings.extend(self._get_microsoft_meetings(days))
-        
-        return meetings
+            yield from self._get_microsoft_meetings(days)
 
     def _get_google_meetings(self, days=1):
         """Get meetings from Google Calendar"""
         if not hasattr(self, 'google_service'):
             return []
 
-        now = datetime.utcnow().isoformat() + 'Z'
-        time_min = (datetime.utcnow() - timedelta(days=days)).isoformat() + 'Z'
-        time_max = (datetime.utcnow() + timedelta(days=days)).isoformat() + 'Z'
-
         try:
-            events_result = self.google_service.events().list(
-                calendarId='primary',
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            return [{
-                'source': 'google',
-                'summary': event.get('summary', ''),
-                'description': event.get('description', ''),
-                'start': event['start'].get('dateTime', ''),
-                'end': event['end'].get('dateTime', '')
-            } for event in events]
+            return self.calendar_sync.sync_google(self.google_service, days)
         except Exception as e:
             print(f"Error getting Google Calendar meetings: {e}")
             return []
@@ -109,25 +161,35 @@ class MeetingAutomation:
             return []
 
         try:
-            days_ago = (datetime.utcnow() - timedelta(days=days)).isoformat()
-            days_ahead = (datetime.utcnow() + timedelta(days=days)).isoformat()
-            url = f'https://graph.microsoft.com/v1.0/me/calendarView?startDateTime={days_ago}&endDateTime={days_ahead}'
-            response = requests.get(url, headers=self.ms_headers)
-            
-            if response.status_code == 200:
-                events = response.json().get('value', [])
-                return [{
-                    'source': 'microsoft',
-                    'summary': event.get('subject', ''),
-                    'description': event.get('bodyPreview', ''),
-                    'start': event['start'].get('dateTime', ''),
-                    'end': event['end'].get('dateTime', '')
-                } for event in events]
-            return []
+            self._refresh_ms_headers()
+            meetings = self.calendar_sync.sync_microsoft(self.ms_headers, days)
+            calendar_ids = [c for c in os.getenv('MS_CALENDAR_IDS', '').split(',') if c]
+            if calendar_ids:
+                meetings.extend(self._get_microsoft_calendar_views(calendar_ids, days))
+            return meetings
         except Exception as e:
             print(f"Error getting Microsoft Calendar meetings: {e}")
             return []
 
+    def _get_microsoft_calendar_views(self, calendar_ids, days=1):
+        """Get meetings from additional Microsoft calendars in Graph batches"""
+        days_ago = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        days_ahead = (datetime.utcnow() + timedelta(days=days)).isoformat()
+        urls = [
+            f'/me/calendars/{calendar_id}/calendarView?startDateTime={days_ago}&endDateTime={days_ahead}'
+            for calendar_id in calendar_ids
+        ]
+
+        return [{
+            'id': event['id'],
+            'source': 'microsoft',
+            'summary': event.get('subject', ''),
+            'description': event.get('bodyPreview', ''),
+            'start': event['start'].get('dateTime', ''),
+            'end': event['end'].get('dateTime', ''),
+            'updated': event.get('lastModifiedDateTime', '')
+        } for _, event in self._get_graph_batch().iter_collections(urls)]
+
     def get_collaboration_messages(self, search_term, days=1):
         """Search all configured collaboration tools for messages"""
         messages = []
@@ -146,160 +208,276 @@ class MeetingAutomation:
         
         return messages
 
+    def _get_max_context_items(self):
+        """Get the maximum number of items kept per context source"""
+        return int(os.getenv('CONTEXT_MAX_ITEMS', 200))
+
+    def _get_max_context_scan(self, source=None):
+        """Get the maximum number of items read from a source before ranking
+
+        Searched sources such as Gmail and Drive have their own, smaller cap
+        (<SOURCE>_MAX_SCAN), since every item they return costs a request.
+        """
+        if source:
+            return int(os.getenv(f'{source.upper()}_MAX_SCAN', 200))
+        return int(os.getenv('CONTEXT_MAX_SCAN', 5000))
+
+    def _rank_context(self, search_term, items, text):
+        """Keep the items most relevant to the search term, best first, using BM25
+
+        Near-duplicates are collapsed first so copies are not ranked or sent twice.
+        """
+        if self.deduplicator:
+            items, _ = self.deduplicator.dedupe_items(items, text)
+        return rank_items(search_term, items, self._get_max_context_items(), text)
+
+    def _get_search_terms(self, search_term):
+        """Get the distinct terms of a search, limited for use in API queries"""
+        terms = list(dict.fromkeys(tokenize(search_term)))
+        return terms[:int(os.getenv('CONTEXT_MAX_QUERY_TERMS', 10))]
+
+    def iter_slack_messages(self, days=1):
+        """Yield Slack messages from the last `days` days, channel by channel"""
+        oldest = (datetime.utcnow() - timedelta(days=days)).timestamp()
+        channels = iter_slack_items(
+            self.slack_client.conversations_list,
+            'channels',
+            types="public_channel,private_channel",
+            limit=200
+        )
+
+        for channel in channels:
+            try:
+                history = iter_slack_items(
+                    self.slack_client.conversations_history,
+                    'messages',
+                    channel=channel['id'],
+                    oldest=str(oldest),
+                    limit=200
+                )
+                for message in history:
+                    yield {
+                        'source': 'slack',
+                        'channel': channel['name'],
+                        'user': message.get('user', 'unknown'),
+                        'text': message.get('text', ''),
+                        'timestamp': message.get('ts', ''),
+                        'platform': 'slack'
+                    }
+            except SlackApiError as e:
+                print(f"Error searching Slack channel {channel['name']}: {e}")
+
     def _get_slack_messages(self, search_term, days=1):
         """Search Slack channels for messages"""
         try:
-            # First get all channels
-            channels = self.slack_client.conversations_list(
-                types="public_channel,private_channel",
-                limit=100
-            )
-            
-            messages = []
-            
-            # Search each channel
-            for channel in channels.data['channels']:
-                try:
-                    # Get channel history
-                    history = self.slack_client.conversations_history(
-                        channel=channel['id'],
-                        limit=100
-                    )
-                    
-                    # Filter messages based on search term
-                    for message in history.data['messages']:
-                        if search_term.lower() in message.get('text', '').lower():
-                            messages.append({
-                                'source': 'slack',
-                                'channel': channel['name'],
-                                'user': message.get('user', 'unknown'),
-                                'text': message.get('text', ''),
-                                'timestamp': message.get('ts', ''),
-                                'platform': 'slack'
-                            })
-                except SlackApiError as e:
-                    print(f"Error searching Slack channel {channel['name']}: {e}")
-            
-            return messages
+            if self.slack_index:
+                self.slack_index.refresh(self.slack_client)
+                return self.slack_index.search(search_term, days, self._get_max_context_items())
+
+            messages = islice(self.iter_slack_messages(days), self._get_max_context_scan())
+            return self._rank_context(search_term, list(messages), lambda message: message['text'])
             
         except SlackApiError as e:
             print(f"Error searching Slack: {e}")
             return []
 
+    def iter_webex_messages(self, days=1):
+        """Yield Webex messages room by room; the SDK pages lazily"""
+        for room in self.webex_api.rooms.list():
+            try:
+                for message in self.webex_api.messages.list(roomId=room.id):
+                    yield {
+                        'source': 'webex',
+                        'channel': room.title,
+                        'user': message.personEmail,
+                        'text': message.text or '',
+                        'timestamp': str(message.created),
+                        'platform': 'webex'
+                    }
+            except Exception as e:
+                print(f"Error searching Webex room {room.title}: {e}")
+
     def _get_webex_messages(self, search_term, days=1):
         """Search Webex spaces for messages"""
         try:
-            # Get all rooms
-            rooms = self.webex_api.rooms.list()
-            messages = []
-            
-            for room in rooms:
-                try:
-                    # Get messages from room
-                    room_messages = self.webex_api.messages.list(roomId=room.id)
-                    for message in room_messages:
-                        if search_term.lower() in message.text.lower():
-                            messages.append({
-                                'source': 'webex',
-                                'channel': room.title,
-                                'user': message.personEmail,
-                                'text': message.text,
-                                'timestamp': message.created,
-                                'platform': 'webex'
-                            })
-                except Exception as e:
-                    print(f"Error searching Webex room {room.title}: {e}")
-            
-            return messages
+            messages = islice(self.iter_webex_messages(days), self._get_max_context_scan())
+            return self._rank_context(search_term, list(messages), lambda message: message['text'])
         except Exception as e:
             print(f"Error searching Webex: {e}")
             return []
 
+    def _get_graph_batch(self):
+        """Get the shared Microsoft Graph batch client"""
+        if not hasattr(self, 'graph_batch'):
+            self.graph_batch = GraphBatchClient(self.ms_headers)
+        return self.graph_batch
+
+    def iter_teams_messages(self, days=1):
+        """Yield Microsoft Teams chat messages, fetching 20 chats per Graph batch"""
+        chats = list(iter_graph_items('https://graph.microsoft.com/v1.0/me/chats', self.ms_headers))
+        messages_urls = [f'/me/chats/{chat["id"]}/messages' for chat in chats]
+
+        for index, msg in self._get_graph_batch().iter_collections(messages_urls):
+            chat = chats[index]
+            yield {
+                'source': 'teams',
+                'channel': chat.get('topic') or 'Chat',
+                'user': (msg.get('from') or {}).get('user', {}).get('email', 'unknown'),
+                'text': msg.get('body', {}).get('content', ''),
+                'timestamp': msg.get('createdDateTime', ''),
+                'platform': 'teams'
+            }
+
     def _get_teams_messages(self, search_term, days=1):
         """Search Microsoft Teams messages"""
         try:
-            # Get chats
-            url = 'https://graph.microsoft.com/v1.0/me/chats'
-            response = requests.get(url, headers=self.ms_headers)
-            
-            if response.status_code == 200:
-                chats = response.json().get('value', [])
-                messages = []
-                
-                for chat in chats:
-                    # Get messages from chat
-                    messages_url = f'https://graph.microsoft.com/v1.0/me/chats/{chat["id"]}/messages'
-                    msg_response = requests.get(messages_url, headers=self.ms_headers)
-                    
-                    if msg_response.status_code == 200:
-                        chat_messages = msg_response.json().get('value', [])
-                        for msg in chat_messages:
-                            if search_term.lower() in msg.get('body', {}).get('content', '').lower():
-                                messages.append({
-                                    'source': 'teams',
-                                    'channel': chat.get('topic', 'Chat'),
-                                    'user': msg.get('from', {}).get('user', {}).get('email', 'unknown'),
-                                    'text': msg.get('body', {}).get('content', ''),
-                                    'timestamp': msg.get('createdDateTime', ''),
-                                    'platform': 'teams'
-                                })
-                return messages
-            return []
+            messages = islice(self.iter_teams_messages(days), self._get_max_context_scan())
+            return self._rank_context(search_term, list(messages), lambda message: message['text'])
         except Exception as e:
             print(f"Error searching Teams: {e}")
             return []
 
-    def get_gmail_messages(self, search_term, days=1):
-        """Search Gmail for messages related to the meeting"""
-        service = build('gmail', 'v1', credentials=self._get_calendar_service().credentials)
-        
-        query = f"subject:{search_term} OR from:{search_term}"
-        results = service.users().messages().list(userId='me', q=query).execute()
-        messages = []
-        
-        for msg in results.get('messages', []):
-            message = service.users().messages().get(userId='me', id=msg['id']).execute()
-            payload = message['payload']
-            headers = payload['headers']
-            
-            subject = ''
-            sender = ''
-            date = ''
-            
-            for header in headers:
-                if header['name'] == 'Subject':
-                    subject = header['value']
-                elif header['name'] == 'From':
-                    sender = header['value']
-                elif header['name'] == 'Date':
-                    date = header['value']
-            
-            if 'parts' in payload:
-                parts = payload['parts']
+    def _execute_gmail_batch(self, service, requests_by_id):
+        """Run Gmail API requests as one batch HTTP call, keyed by message ID"""
+        responses = {}
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                print(f"Error fetching Gmail message {request_id}: {exception}")
+            else:
+                responses[request_id] = response
+
+        batch = service.new_batch_http_request(callback=collect)
+        for message_id, request in requests_by_id.items():
+            batch.add(request, request_id=message_id)
+        batch.execute()
+        return responses
+
+    def iter_gmail_metadata(self, query):
+        """Yield the headers and snippet of Gmail messages matching a query.
+
+        Message IDs are listed page by page and their metadata fetched in
+        batch HTTP calls of GMAIL_BATCH_SIZE, without the message bodies.
+        """
+        service = self.google_clients.get_service('gmail', 'v1')
+        messages = service.users().messages()
+        batch_size = int(os.getenv('GMAIL_BATCH_SIZE', 50))
+        message_ids = iter_google_items(
+            messages.list,
+            'messages',
+            userId='me',
+            q=query,
+            fields='nextPageToken,messages/id'
+        )
+
+        while True:
+            ids = [msg['id'] for msg in islice(message_ids, batch_size)]
+            if not ids:
+                return
+
+            headers_by_id = self._execute_gmail_batch(service, {
+                message_id: messages.get(
+                    userId='me',
+                    id=message_id,
+                    format='metadata',
+                    metadataHeaders=['Subject', 'From', 'Date'],
+                    fields='id,snippet,payload/headers'
+                )
+                for message_id in ids
+            })
+
+            # Keep the order Gmail listed the messages in
+            for message_id in ids:
+                if message_id not in headers_by_id:
+                    continue
+                message = headers_by_id[message_id]
+                metadata = {'id': message_id, 'subject': '', 'sender': '', 'date': '',
+                            'snippet': message.get('snippet', '')}
+                for header in message.get('payload', {}).get('headers', []):
+                    if header['name'] == 'Subject':
+                        metadata['subject'] = header['value']
+                    elif header['name'] == 'From':
+                        metadata['sender'] = header['value']
+                    elif header['name'] == 'Date':
+                        metadata['date'] = header['value']
+                yield metadata
+
+    def _fetch_gmail_bodies(self, metadata_list):
+        """Fetch the plain-text bodies of Gmail messages in batch HTTP calls"""
+        service = self.google_clients.get_service('gmail', 'v1')
+        messages = service.users().messages()
+        batch_size = int(os.getenv('GMAIL_BATCH_SIZE', 50))
+        results = []
+
+        for offset in range(0, len(metadata_list), batch_size):
+            batch = metadata_list[offset:offset + batch_size]
+            bodies_by_id = self._execute_gmail_batch(service, {
+                metadata['id']: messages.get(
+                    userId='me',
+                    id=metadata['id'],
+                    format='full',
+                    fields='id,payload(mimeType,body/data,parts(mimeType,body/data))'
+                )
+                for metadata in batch
+            })
+
+            for metadata in batch:
+                if metadata['id'] not in bodies_by_id:
+                    continue
+                payload = bodies_by_id[metadata['id']]['payload']
+                parts = payload.get('parts', [payload])
                 for part in parts:
-                    if part['mimeType'] == 'text/plain':
-                        body = part['body']
-                        data = body['data']
-                        text = base64.urlsafe_b64decode(data).decode()
-                        messages.append({
-                            'subject': subject,
-                            'sender': sender,
-                            'date': date,
-                            'content': text
+                    if part['mimeType'] == 'text/plain' and part.get('body', {}).get('data'):
+                        text = base64.urlsafe_b64decode(part['body']['data']).decode()
+                        results.append({
+                            'subject': metadata['subject'],
+                            'sender': metadata['sender'],
+                            'date': metadata['date'],
+                            # Earlier messages in the thread are fetched on their own
+                            'content': strip_quoted_history(text)
                         })
-        return messages
+        return results
 
-    def get_drive_files(self, search_term, days=1):
-        """Search Google Drive for files related to the meeting"""
-        drive_service = build('drive', 'v3', credentials=self._get_calendar_service().credentials)
+    def get_gmail_messages(self, search_term, days=1):
+        """Search recent Gmail for messages related to the meeting.
+
+        Headers and snippets of up to GMAIL_MAX_SCAN matches are ranked with
+        BM25 first, and bodies are fetched only for the GMAIL_MAX_BODIES best.
+        """
+        terms = self._get_search_terms(search_term)
+        if not terms:
+            return []
+        # Gmail treats {a b c} as "any of a, b or c"
+        query = "{" + " ".join(terms) + "}" + f" newer_than:{days}d"
+        headers = list(islice(self.iter_gmail_metadata(query), self._get_max_context_scan('gmail')))
+        best = rank_items(search_term, headers, int(os.getenv('GMAIL_MAX_BODIES', 20)),
+                          lambda metadata: f"{metadata['subject']} {metadata['sender']} {metadata['snippet']}")
+        messages = self._fetch_gmail_bodies(best)
+        return self._rank_context(
+            search_term, messages, lambda message: f"{message['subject']} {message['content']}")
+
+    def iter_drive_files(self, query):
+        """Yield Google Drive files matching a query, page by page"""
+        drive_service = self.google_clients.get_service('drive', 'v3')
         
-        query = f"name contains '{search_term}'"
-        results = drive_service.files().list(
+        yield from iter_google_items(
+            drive_service.files().list,
+            'files',
             q=query,
             fields="nextPageToken, files(id, name, mimeType, modifiedTime)"
-        ).execute()
-        
-        return results.get('files', [])
+        )
+
+    def get_drive_files(self, search_term, days=1):
+        """Search Google Drive for files related to the meeting and modified in the last `days` days"""
+        terms = self._get_search_terms(search_term)
+        if not terms:
+            return []
+        modified_after = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%S')
+        query = "(" + " or ".join(f"name contains '{term}'" for term in terms) + ")"
+        query += f" and modifiedTime > '{modified_after}'"
+        files = islice(self.iter_drive_files(query), self._get_max_context_scan('drive'))
+        # Split names like "q3_roadmap-v2.pdf" into terms before ranking
+        return self._rank_context(search_term, list(files), lambda file: re.sub(r'[_\-.]', ' ', file['name']))
 
     def _get_model_config(self, model_type):
         """Get configuration for a specific AI model"""
@@ -347,6 +525,11 @@ class MeetingAutomation:
             config['eos_token_id'] = int(os.getenv('HUGGINGFACE_EOS_TOKEN_ID', 2))
             config['device'] = os.getenv('HUGGINGFACE_DEVICE', 'cuda')
             config['model_cache_dir'] = os.getenv('HUGGINGFACE_MODEL_CACHE_DIR', '~/.cache/huggingface/models')
+            config['backend'] = os.getenv('HUGGINGFACE_BACKEND', 'pytorch')
+            config['onnx_dir'] = os.getenv('HUGGINGFACE_ONNX_DIR')
+            config['batch_size'] = int(os.getenv('HUGGINGFACE_BATCH_SIZE', 8))
+            config['num_threads'] = int(os.getenv('HUGGINGFACE_NUM_THREADS', 0))
+            config['batch_max_wait_ms'] = int(os.getenv('HUGGINGFACE_BATCH_MAX_WAIT_MS', 50))
         elif model_type == 'azure':
             config['model'] = os.getenv('AZURE_MODEL', 'gpt-4')
             config['max_tokens'] = int(os.getenv('AZURE_MAX_TOKENS', 2000))
@@ -384,32 +567,65 @@ class MeetingAutomation:
         
         return config
 
-    def get_ai_model(self):
-        """Get the configured AI model based on environment settings"""
-        model_type = os.getenv('DEFAULT_AI_MODEL', 'openai').lower()
+    def get_ai_model(self, model_type=None):
+        """Get the configured AI model based on environment settings, or model_type if given"""
+        model_type = (model_type or os.getenv('DEFAULT_AI_MODEL', 'openai')).lower()
         
-        if model_type not in ['openai', 'anthropic', 'google', 'cohere', 'huggingface', 'azure', 'sagemaker']:
+        if model_type not in MODEL_PROVIDERS:
             raise ValueError(f"Unknown AI model type: {model_type}")
             
-        try:
-            if model_type == 'openai':
-                return self._get_openai_model()
-            elif model_type == 'anthropic':
-                return self._get_anthropic_model()
-            elif model_type == 'google':
-                return self._get_google_model()
-            elif model_type == 'cohere':
-                return self._get_cohere_model()
-            elif model_type == 'huggingface':
-                return self._get_huggingface_model()
-            elif model_type == 'azure':
-                return self._get_azure_model()
-            elif model_type == 'sagemaker':
-                return self._get_sagemaker_model()
-        except Exception as e:
-            print(f"Error initializing {model_type} model: {str(e)}")
+        # Models are loaded once per provider and configuration, and shared by every meeting and worker
+        key = self._model_cache_key(model_type)
+        with self._model_lock:
+            if key in self._models:
+                return self._models[key]
+            try:
+                started = time.perf_counter()
+                model = getattr(self, MODEL_PROVIDERS[model_type])()
+            except Exception as e:
+                print(f"Error initializing {model_type} model: {str(e)}")
+                return None
+            if model:
+                self.model_load_times[model_type] = time.perf_counter() - started
+                self._models[key] = model
+            return model
+
+    def _model_cache_key(self, model_type):
+        """Key a loaded model by provider and configuration, as AIModelFactory does"""
+        return AIModelFactory.cache_key(model_type, self._get_model_config(model_type))
+
+    def get_failover_model(self):
+        """Get the model that hedges and fails over across AI_MODEL_FALLBACKS, or None"""
+        primary = os.getenv('DEFAULT_AI_MODEL', 'openai').lower()
+        fallbacks = [name.strip().lower() for name in os.getenv('AI_MODEL_FALLBACKS', '').split(',')
+                     if name.strip() and name.strip().lower() != primary]
+        if not fallbacks:
             return None
 
+        if MeetingAutomation._failover_model is None:
+            models = {}
+            for model_type in [primary] + fallbacks:
+                model = self.get_ai_model(model_type)
+                if model:
+                    models[model_type] = ProviderModel(self, model)
+            if not models:
+                return None
+            with self._model_lock:
+                if MeetingAutomation._failover_model is None:
+                    MeetingAutomation._failover_model = HedgedModel(
+                        models,
+                        hedge_percentile=float(os.getenv('AI_HEDGE_PERCENTILE', 95)),
+                        min_samples=int(os.getenv('AI_HEDGE_MIN_SAMPLES', 20)),
+                        initial_delay=float(os.getenv('AI_HEDGE_INITIAL_DELAY', 10))
+                    )
+        return MeetingAutomation._failover_model
+
+    def warmup(self):
+        """Load the configured AI model before the first meeting is processed"""
+        model_type = os.getenv('DEFAULT_AI_MODEL', 'openai').lower()
+        if self.get_ai_model() and model_type in self.model_load_times:
+            print(f"Loaded {model_type} model in {self.model_load_times[model_type]:.2f}s")
+
     def _get_huggingface_model(self):
         """Initialize HuggingFace model"""
         try:
@@ -418,28 +634,14 @@ class MeetingAutomation:
                 raise ValueError("HuggingFace API key not configured")
                 
             config = self._get_model_config('huggingface')
-            model_name = config['model']
+            config['api_key'] = api_key
             
-            # Initialize model
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
-            model = AutoModelForCausalLM.from_pretrained(
-                model_name,
-                trust_remote_code=True,
-                use_auth_token=api_key
-            )
-            
-            # Create pipeline
-            pipe = pipeline(
-                "text-generation",
-                model=model,
-                tokenizer=tokenizer,
-                max_new_tokens=config['max_tokens'],
-                temperature=config['temperature'],
-                top_p=config['top_p']
-            )
+            # Batches prompts from concurrent meetings through one pipeline
+            model = HuggingFaceModel(config)
             
             return {
-                'client': pipe,
+                'provider': 'huggingface',
+                'client': model,
                 'config': config
             }
         except Exception as e:
@@ -454,16 +656,21 @@ class MeetingAutomation:
             if not api_key or not endpoint:
                 raise ValueError("Azure API key and endpoint not configured")
                 
+            import openai
+
             config = self._get_model_config('azure')
             
             # Initialize Azure OpenAI client
-            openai.api_type = "azure"
-            openai.api_version = "2023-05-15-preview"
-            openai.api_base = endpoint
-            openai.api_key = api_key
+            client = openai.AzureOpenAI(
+                api_key=api_key,
+                api_version="2023-05-15-preview",
+                azure_endpoint=endpoint,
+                max_retries=0
+            )
             
             return {
-                'client': openai,
+                'provider': 'azure',
+                'client': client,
                 'config': config
             }
         except Exception as e:
@@ -480,6 +687,9 @@ class MeetingAutomation:
             if not access_key or not secret_key or not endpoint:
                 raise ValueError("AWS credentials and SageMaker endpoint not configured")
                 
+            import boto3
+            from botocore.config import Config as BotoConfig
+
             config = self._get_model_config('sagemaker')
             
             # Initialize SageMaker client
@@ -489,9 +699,13 @@ class MeetingAutomation:
                 region_name=region
             )
             
-            client = boto3.client('sagemaker-runtime')
+            client = boto3.client(
+                'sagemaker-runtime',
+                config=BotoConfig(read_timeout=config['timeout'], retries={'total_max_attempts': 1})
+            )
             
             return {
+                'provider': 'sagemaker',
                 'client': client,
                 'endpoint': endpoint,
                 'config': config
@@ -507,10 +721,13 @@ class MeetingAutomation:
             if not api_key:
                 raise ValueError("OpenAI API key not configured")
                 
+            import openai
+
             config = self._get_model_config('openai')
-            openai.api_key = api_key
             return {
-                'client': openai,
+                'provider': 'openai',
+                # Retries are handled by the retry engine, not the SDK
+                'client': openai.OpenAI(api_key=api_key, max_retries=0),
                 'config': config
             }
         except Exception as e:
@@ -524,9 +741,12 @@ class MeetingAutomation:
             if not api_key:
                 raise ValueError("Anthropic API key not configured")
                 
+            import anthropic
+
             config = self._get_model_config('anthropic')
             return {
-                'client': anthropic.Anthropic(api_key=api_key),
+                'provider': 'anthropic',
+                'client': anthropic.Anthropic(api_key=api_key, max_retries=0),
                 'config': config
             }
         except Exception as e:
@@ -540,9 +760,12 @@ class MeetingAutomation:
             if not api_key:
                 raise ValueError("Google API key not configured")
                 
+            import google.generativeai as genai
+
             config = self._get_model_config('google')
             genai.configure(api_key=api_key)
             return {
+                'provider': 'google',
                 'client': genai.GenerativeModel(model=config['model']),
                 'config': config
             }
@@ -557,30 +780,22 @@ class MeetingAutomation:
             if not api_key:
                 raise ValueError("Cohere API key not configured")
                 
+            import cohere
+
             config = self._get_model_config('cohere')
             return {
-                'client': cohere.Client(api_key),
+                'provider': 'cohere',
+                'client': cohere.Client(api_key, max_retries=0, timeout=config['timeout']),
                 'config': config
             }
         except Exception as e:
             print(f"Error configuring Cohere model: {str(e)}")
             return None
 
-    def _retry_with_backoff(self, func, *args, **kwargs):
-        """Retry function with exponential backoff"""
-        max_retries = kwargs.get('max_retries', 3)
-        timeout = kwargs.get('timeout', 30)
-        
-        for attempt in range(max_retries):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise
-                wait_time = 2 ** attempt
-                print(f"Attempt {attempt + 1} failed: {str(e)}")
-                print(f"Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
+    def _call_with_retry(self, ai_model, func, *args, **kwargs):
+        """Call a provider SDK function under the retry policy and circuit breaker for that provider"""
+        policy = RetryPolicy.from_env(max_attempts=ai_model['config'].get('max_retries'))
+        return self.retry_engine.call(ai_model['provider'], func, args, kwargs, policy=policy)
 
     def _format_summary(self, summary_text):
         """Format the summary based on configuration"""
@@ -607,17 +822,180 @@ class MeetingAutomation:
         include_key_points = os.getenv('INCLUDE_KEY_POINTS', 'true').lower() == 'true'
         include_decisions = os.getenv('INCLUDE_DECISIONS', 'true').lower() == 'true'
         
-        prompt = f"Please summarize the following meeting information:\n\n{meeting_details}\n\n"
+        # Instructions first: they are the same for every meeting, so providers can cache them
+        instructions = "Please summarize the meeting information that follows these instructions.\n"
         
         if include_action_items:
-            prompt += "Include a list of action items with responsible parties.\n"
+            instructions += "Include a list of action items with responsible parties.\n"
         if include_key_points:
-            prompt += "Highlight key discussion points and decisions made.\n"
+            instructions += "Highlight key discussion points and decisions made.\n"
         if include_decisions:
-            prompt += "Clearly mark any important decisions and their implications.\n"
+            instructions += "Clearly mark any important decisions and their implications.\n"
             
-        prompt += "Keep the summary concise and focused on the most important information."
-        return prompt
+        instructions += "Keep the summary concise and focused on the most important information.\n"
+        instructions += output_schema(include_key_points, include_decisions, include_action_items)
+
+        info = meeting_details.get('meeting_info', {})
+        content = "Meeting information:\n\n"
+        content += f"Subject: {info.get('subject', 'No subject')}\n"
+        content += f"Description: {info.get('description', 'No description')}\n"
+        content += f"Start: {info.get('start_time', 'No start time')}\n"
+        content += f"End: {info.get('end_time', 'No end time')}\n"
+        # Render context exactly as the packer counted it, one line per item
+        context = render_context({source: items for source, items in meeting_details.items()
+                                  if source != 'meeting_info'})
+        if context:
+            content += f"\nRelated context:\n{context}\n"
+        return Prompt(instructions, content)
+
+    def _generate_summary(self, model, prompt):
+        """Call the configured AI model for a prompt"""
+        config = model['config']
+
+        # Generate summary with retry logic
+        provider = model['provider']
+        # Stable instructions go in the system prompt so they form a cacheable prefix
+        system, content = split_prompt(prompt)
+        if provider == 'openai':
+            response = self._call_with_retry(
+                model,
+                model['client'].chat.completions.create,
+                model=config['model'],
+                messages=[
+                    {
+                        "role": "system",
+                        "content": system
+                    },
+                    {
+                        "role": "user",
+                        "content": content
+                    }
+                ],
+                max_tokens=config['max_tokens'],
+                temperature=config['temperature'],
+                top_p=config['top_p'],
+                timeout=config['timeout']
+            )
+            self.prompt_cache.record_openai(response.usage)
+            summary = response.choices[0].message.content
+
+        elif provider == 'anthropic':
+            response = self._call_with_retry(
+                model,
+                model['client'].messages.create,
+                model=config['model'],
+                max_tokens=config['max_tokens'],
+                temperature=config['temperature'],
+                top_p=config['top_p'],
+                system=[
+                    {
+                        "type": "text",
+                        "text": system,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": content
+                    }
+                ],
+                extra_headers=ANTHROPIC_CACHE_HEADERS,
+                timeout=config['timeout']
+            )
+            self.prompt_cache.record_anthropic(response.usage)
+            summary = ''.join(block.text for block in response.content if block.type == 'text')
+
+        elif provider == 'google':
+            response = self._call_with_retry(
+                model,
+                model['client'].generate_content,
+                prompt,
+                generation_config={
+                    'max_output_tokens': config['max_output_tokens'],
+                    'temperature': config['temperature'],
+                    'top_p': config['top_p']
+                },
+                request_options={'timeout': config['timeout']}
+            )
+            summary = response.text
+
+        elif provider == 'cohere':
+            response = self._call_with_retry(
+                model,
+                model['client'].generate,
+                model=config['model'],
+                prompt=prompt,
+                max_tokens=config['max_tokens'],
+                temperature=config['temperature']
+            )
+            summary = response.generations[0].text
+
+        elif provider == 'huggingface':
+            # Batched HuggingFace pipeline
+            summary = self._call_with_retry(
+                model,
+                model['client'].generate,
+                prompt
+            )
+
+        elif provider == 'azure':
+            # Azure OpenAI client
+            response = self._call_with_retry(
+                model,
+                model['client'].chat.completions.create,
+                model=config['model'],
+                messages=[
+                    {
+                        "role": "system",
+                        "content": system
+                    },
+                    {
+                        "role": "user",
+                        "content": content
+                    }
+                ],
+                max_tokens=config['max_tokens'],
+                temperature=config['temperature'],
+                top_p=config['top_p'],
+                presence_penalty=config['presence_penalty'],
+                frequency_penalty=config['frequency_penalty'],
+                stop=config['stop_sequences'] or None,
+                timeout=config['timeout']
+            )
+            self.prompt_cache.record_openai(response.usage)
+            summary = response.choices[0].message.content
+
+        elif provider == 'sagemaker':
+            # SageMaker client
+            payload = {
+                "inputs": prompt,
+                "parameters": {
+                    "max_new_tokens": config['max_tokens'],
+                    "temperature": config['temperature'],
+                    "top_p": config['top_p'],
+                    "top_k": config['top_k'],
+                    "repetition_penalty": config['repetition_penalty'],
+                    "do_sample": config['do_sample'],
+                    "num_return_sequences": config['num_return_sequences'],
+                    "max_time": config['max_time'],
+                    "min_length": config['min_length'],
+                    "early_stopping": config['early_stopping']
+                }
+            }
+
+            response = self._call_with_retry(
+                model,
+                model['client'].invoke_endpoint,
+                EndpointName=model['endpoint'],
+                ContentType="application/json",
+                Body=json.dumps(payload)
+            )
+
+            response_body = json.loads(response['Body'].read().decode())
+            summary = response_body[0]['generated_text']
+
+        return summary
 
     def summarize_meeting(self, meeting_details):
         """Generate a summary using configured AI model with error handling"""
@@ -628,208 +1006,387 @@ class MeetingAutomation:
 
             # Prepare prompt with configuration
             prompt = self._generate_summary_prompt(meeting_details)
-            config = model['config']
-
-            # Generate summary with retry logic
-            if isinstance(model['client'], openai):
-                response = self._retry_with_backoff(
-                    model['client'].ChatCompletion.create,
-                    model=config['model'],
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a professional meeting assistant."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=config['max_tokens'],
-                    temperature=config['temperature'],
-                    top_p=config['top_p'],
-                    timeout=config['timeout'],
-                    max_retries=config['max_retries']
-                )
-                summary = response.choices[0].message.content
-
-            elif isinstance(model['client'], anthropic.Anthropic):
-                response = self._retry_with_backoff(
-                    model['client'].chat.completions.create,
-                    model=config['model'],
-                    max_tokens=config['max_tokens'],
-                    temperature=config['temperature'],
-                    top_p=config['top_p'],
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    timeout=config['timeout'],
-                    max_retries=config['max_retries']
-                )
-                summary = response.content.text
-
-            elif isinstance(model['client'], genai.GenerativeModel):
-                response = self._retry_with_backoff(
-                    model['client'].generate_content,
-                    prompt,
-                    max_output_tokens=config['max_output_tokens'],
-                    temperature=config['temperature'],
-                    top_p=config['top_p'],
-                    timeout=config['timeout'],
-                    max_retries=config['max_retries']
-                )
-                summary = response.text[0]
-
-            elif isinstance(model['client'], cohere.Client):
-                response = self._retry_with_backoff(
-                    model['client'].generate,
-                    model=config['model'],
-                    prompt=prompt,
-                    max_tokens=config['max_tokens'],
-                    temperature=config['temperature'],
-                    timeout=config['timeout'],
-                    max_retries=config['max_retries']
-                )
-                summary = response.generations[0].text
-
-            elif isinstance(model['client'], pipeline):
-                # HuggingFace pipeline
-                response = self._retry_with_backoff(
-                    model['client'],
-                    prompt,
-                    max_new_tokens=config['max_tokens'],
-                    temperature=config['temperature'],
-                    top_p=config['top_p'],
-                    top_k=config['top_k'],
-                    repetition_penalty=config['repetition_penalty'],
-                    do_sample=config['do_sample'],
-                    use_cache=config['use_cache'],
-                    num_beams=config['num_beams'],
-                    max_time=config['max_time'],
-                    min_length=config['min_length'],
-                    early_stopping=config['early_stopping'],
-                    pad_token_id=config['pad_token_id'],
-                    eos_token_id=config['eos_token_id'],
-                    timeout=config['timeout'],
-                    max_retries=config['max_retries']
-                )
-                summary = response[0]['generated_text']
-
-            elif isinstance(model['client'], openai):
-                # Azure OpenAI client
-                response = self._retry_with_backoff(
-                    model['client'].ChatCompletion.create,
-                    engine=config['model'],
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a professional meeting assistant."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=config['max_tokens'],
-                    temperature=config['temperature'],
-                    top_p=config['top_p'],
-                    top_k=config['top_k'],
-                    presence_penalty=config['presence_penalty'],
-                    frequency_penalty=config['frequency_penalty'],
-                    stop=config['stop_sequences'],
-                    timeout=config['timeout'],
-                    max_retries=config['max_retries']
-                )
-                summary = response.choices[0].message.content
-
-            elif isinstance(model['client'], boto3.client):
-                # SageMaker client
-                payload = {
-                    "inputs": prompt,
-                    "parameters": {
-                        "max_new_tokens": config['max_tokens'],
-                        "temperature": config['temperature'],
-                        "top_p": config['top_p'],
-                        "top_k": config['top_k'],
-                        "repetition_penalty": config['repetition_penalty'],
-                        "do_sample": config['do_sample'],
-                        "num_return_sequences": config['num_return_sequences'],
-                        "max_time": config['max_time'],
-                        "min_length": config['min_length'],
-                        "early_stopping": config['early_stopping']
-                    }
-                }
-                
-                response = self._retry_with_backoff(
-                    model['client'].invoke_endpoint,
-                    EndpointName=model['endpoint'],
-                    ContentType="application/json",
-                    Body=json.dumps(payload),
-                    TimeoutInSeconds=config['timeout']
-                )
-                
-                response_body = json.loads(response['Body'].read().decode())
-                summary = response_body[0]['generated_text']
+
+            # Reuse the cached summary if neither the prompt nor the model changed
+            failover = self.get_failover_model()
+            candidates = [provider.model for provider in failover.models.values()] if failover else [model]
+            summary = None
+            if self.summary_cache:
+                for candidate in candidates:
+                    summary = self.summary_cache.get(self._summary_cache_key(prompt, candidate))
+                    if summary is not None:
+                        break
+
+            if summary is None:
+                if failover:
+                    # Cache under the provider that answered, which may be a fallback
+                    summary, provider = failover.generate_with_provider(prompt)
+                    answered = failover.models[provider].model
+                else:
+                    summary, answered = self._generate_summary(model, prompt), model
+                if self.summary_cache:
+                    self.summary_cache.set(self._summary_cache_key(prompt, answered), summary)
 
             # Format and return the summary
             return self._format_summary(summary)
 
         except Exception as e:
             print(f"Error generating summary: {str(e)}")
-            return "Failed to generate summary"
+            return SUMMARY_FAILED
 
-    def process_meeting(self, meeting):
-        """Process a single meeting and gather all related information"""
+    def _summary_cache_key(self, prompt, model):
+        """Key a cached summary by prompt, provider, model name and settings"""
+        return SummaryCache.make_key(prompt, model['provider'], model['config']['model'], model['config'])
+
+    def _get_context_sources(self):
+        """Map each configured context source to its fetch function"""
+        sources = {}
+
+        if hasattr(self, 'slack_client'):
+            sources['slack_messages'] = self._get_slack_messages
+        if hasattr(self, 'webex_api'):
+            sources['webex_messages'] = self._get_webex_messages
+        if hasattr(self, 'ms_headers'):
+            sources['teams_messages'] = self._get_teams_messages
+
+        sources['gmail_messages'] = self.get_gmail_messages
+        sources['drive_files'] = self.get_drive_files
+        return sources
+
+    def _get_source_timeout(self, source):
+        """Get the fetch timeout in seconds for a context source"""
+        default = float(os.getenv('CONTEXT_SOURCE_TIMEOUT', 30))
+        name = source.split('_')[0].upper()
+        return float(os.getenv(f'{name}_CONTEXT_TIMEOUT', default))
+
+    def _get_context_packer(self):
+        """Get a context packer counting tokens for the configured model"""
+        if not hasattr(self, 'context_packer'):
+            model_type = os.getenv('DEFAULT_AI_MODEL', 'openai').lower()
+            model_name = self._get_model_config(model_type).get('model', '')
+            self.context_packer = ContextPacker(get_token_counter(model_type, model_name))
+        return self.context_packer
+
+    def gather_context(self, search_term, days=1):
+        """Query all configured context sources concurrently.
+
+        Every source is started at once and given its own timeout, measured
+        from when its fetch starts rather than from when it was queued. A
+        source that does not answer in time contributes an empty list and is
+        listed under 'timed_out_sources'; one that raises is listed under
+        'failed_sources'. The summary is still built from the sources that
+        did respond.
+        """
+        fetches = self._get_context_sources()
+        started = {}
+        running = {source: threading.Event() for source in fetches}
+
+        def fetch_from(source, fetch):
+            started[source] = time.monotonic()
+            running[source].set()
+            return fetch(search_term, days)
+
+        submitted = time.monotonic()
+        futures = {source: self.context_executor.submit(fetch_from, source, fetch)
+                   for source, fetch in fetches.items()}
+
+        context = {'timed_out_sources': [], 'failed_sources': []}
+        for source, future in futures.items():
+            timeout = self._get_source_timeout(source)
+            try:
+                # A fetch still queued behind other meetings after its own timeout is given up on too
+                if not running[source].wait(timeout=max(0, submitted + timeout - time.monotonic())):
+                    raise FuturesTimeoutError()
+                deadline = started[source] + timeout
+                context[source] = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                # A queued fetch is cancelled; a running one finishes in the background
+                future.cancel()
+                print(f"Timed out gathering {source} after {timeout}s")
+                context['timed_out_sources'].append(source)
+                context[source] = []
+            except Exception as e:
+                print(f"Error gathering {source}: {e}")
+                context['failed_sources'].append(source)
+                context[source] = []
+
+        return context
+
+    def _size_context_pool(self, workers):
+        """Give each meeting processed concurrently its own thread per context source"""
+        needed = max(1, workers) * len(self._get_context_sources())
+        if needed > self.context_workers:
+            previous = self.context_executor
+            self.context_workers = needed
+            self.context_executor = ThreadPoolExecutor(max_workers=needed, thread_name_prefix='context')
+            previous.shutdown(wait=False)
+
+    def _prepare_meeting(self, meeting):
+        """Gather the context for a meeting and pack it into the details for its summary prompt"""
         meeting_info = {
             'subject': meeting.get('summary', 'No subject'),
             'description': meeting.get('description', 'No description'),
-            'start_time': meeting['start'].get('dateTime', 'No start time'),
-            'end_time': meeting['end'].get('dateTime', 'No end time')
+            'start_time': meeting.get('start') or 'No start time',
+            'end_time': meeting.get('end') or 'No end time'
         }
 
-        # Search for related information
+        # Search all sources for related information at the same time
         search_term = f"{meeting_info['subject']} {meeting_info['description']}"
-        
-        slack_messages = self.get_slack_messages(search_term)
-        gmail_messages = self.get_gmail_messages(search_term)
-        drive_files = self.get_drive_files(search_term)
+        context = self.gather_context(search_term)
 
-        # Create a comprehensive summary
-        summary_text = self.summarize_meeting({
-            'meeting_info': meeting_info,
-            'slack_messages': slack_messages,
-            'gmail_messages': gmail_messages,
-            'drive_files': drive_files
-        })
+        # Collapse copies of the same text across sources, e.g. Teams copies of Slack messages
+        sources = {key: value for key, value in context.items()
+                   if key not in ('timed_out_sources', 'failed_sources')}
+        duplicates = {}
+        if self.deduplicator:
+            sources, duplicates = self.deduplicator.dedupe_sources(sources)
 
-        return {
+        # Keep only the most relevant context that fits the token budget
+        packed_context, context_report = self._get_context_packer().pack(search_term, sources)
+        context_report['duplicates_removed'] = duplicates
+
+        result = {
             'meeting_info': meeting_info,
-            'slack_messages': slack_messages,
-            'gmail_messages': gmail_messages,
-            'drive_files': drive_files,
-            'summary': summary_text
+            **context,
+            'context_report': context_report
         }
+        return result, {'meeting_info': meeting_info, **packed_context}
+
+    def process_meeting(self, meeting):
+        """Process a single meeting and gather all related information"""
+        result, meeting_details = self._prepare_meeting(meeting)
+
+        # Create a comprehensive summary
+        result['summary'] = self.summarize_meeting(meeting_details)
+        return result
+
+    def _process_meeting_for_daemon(self, meeting):
+        """Process a meeting, raising when no summary could be generated so the daemon retries it"""
+        result = self.process_meeting(meeting)
+        if result.get('summary') == SUMMARY_FAILED:
+            raise RuntimeError("No summary was generated")
+        return result
+
+    def _process_meeting_safely(self, meeting):
+        """Process a meeting, capturing any failure in the result"""
+        try:
+            return self.process_meeting(meeting)
+        except Exception as e:
+            print(f"Error processing meeting {meeting.get('summary', 'No subject')}: {e}")
+            return {
+                'meeting_info': {
+                    'subject': meeting.get('summary', 'No subject'),
+                    'description': meeting.get('description', 'No description')
+                },
+                'error': str(e)
+            }
+
+    def _prepare_meeting_safely(self, meeting):
+        """Prepare a meeting, returning (error result, None) if anything fails"""
+        try:
+            return self._prepare_meeting(meeting)
+        except Exception as e:
+            print(f"Error processing meeting {meeting.get('summary', 'No subject')}: {e}")
+            return {
+                'meeting_info': {
+                    'subject': meeting.get('summary', 'No subject'),
+                    'description': meeting.get('description', 'No description')
+                },
+                'error': str(e)
+            }, None
+
+    def _summarize_batch(self, prepared, runner):
+        """Summarise prepared meetings with one provider batch job instead of a call per meeting"""
+        model_type = runner.provider
+        config = self._get_model_config(model_type)
+
+        prompts = {}
+        cache_keys = {}
+        for index, (result, meeting_details) in enumerate(prepared):
+            if meeting_details is None:
+                continue
+            prompt = self._generate_summary_prompt(meeting_details)
+            custom_id = make_custom_id(result['meeting_info']['subject'], index)
+            if self.summary_cache:
+                cache_keys[custom_id] = SummaryCache.make_key(prompt, model_type, config['model'], config)
+                summary = self.summary_cache.get(cache_keys[custom_id])
+                if summary is not None:
+                    result['summary'] = self._format_summary(summary)
+                    continue
+            prompts[custom_id] = prompt
+
+        try:
+            summaries = runner.run(prompts)
+        except Exception as e:
+            # A failed or unfinished job becomes an error entry for each meeting it covered
+            summaries = {custom_id: e for custom_id in prompts}
+
+        for index, (result, meeting_details) in enumerate(prepared):
+            custom_id = make_custom_id(result['meeting_info']['subject'], index)
+            if custom_id not in summaries:
+                continue
+            summary = summaries[custom_id]
+            if isinstance(summary, Exception):
+                print(f"Error generating summary: {summary}")
+                result['summary'] = SUMMARY_FAILED
+                continue
+            if custom_id in cache_keys:
+                self.summary_cache.set(cache_keys[custom_id], summary)
+            result['summary'] = self._format_summary(summary)
+        return [result for result, _ in prepared]
+
+    def run(self, workers=None, batch=False):
+        """Main function to process all meetings.
+
+        With more than one worker, meetings are processed concurrently by a
+        bounded pool. Results keep the order returned by get_meeting_details
+        and a failing meeting only produces an error entry for itself.
+
+        With batch=True, context is still gathered per meeting but every
+        summary prompt is sent as one OpenAI or Anthropic batch job, which
+        is cheaper for work that is not latency-sensitive.
+        """
+        if workers is None:
+            workers = int(os.getenv('MEETING_WORKERS', 1))
+        self._size_context_pool(workers)
+
+        runner = None
+        if batch:
+            # Raises for an unsupported provider before any calendar or context is read
+            model_type = os.getenv('DEFAULT_AI_MODEL', 'openai').lower()
+            runner = BatchRunner(model_type, self._get_model_config(model_type))
 
-    def run(self):
-        """Main function to process all meetings"""
         meetings = self.get_meeting_details()
-        processed_meetings = []
 
-        for meeting in meetings:
-            processed_meeting = self.process_meeting(meeting)
-            processed_meetings.append(processed_meeting)
+        if runner:
+            with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='meeting') as executor:
+                prepared = list(executor.map(self._prepare_meeting_safely, meetings))
+            return self._summarize_batch(prepared, runner)
+
+        if os.getenv('AI_MODEL_WARMUP', 'true').lower() == 'true':
+            self.warmup()
+
+        if workers <= 1:
+            results = [self._process_meeting_safely(meeting) for meeting in meetings]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='meeting') as executor:
+                results = list(executor.map(self._process_meeting_safely, meetings))
+
+        if self._failover_model:
+            for provider, stats in self._failover_model.latency_report().items():
+                if stats['count']:
+                    print(f"{provider}: {stats['count']} calls, {stats['errors']} errors, "
+                          f"p50 {stats['p50']:.1f}s, p95 {stats['p95']:.1f}s")
+
+        cache = self.prompt_cache.report()
+        if cache['input_tokens']:
+            print(f"Prompt cache: {cache['cached_tokens']} of {cache['input_tokens']} input tokens cached "
+                  f"({cache['cached_ratio']:.0%})")
+        self._print_summary_cache_stats()
 
-        return processed_meetings
+        model = self._models.get(self._model_cache_key('huggingface'))
+        if model:
+            stats = model['client'].throughput()
+            print(f"Generated {stats['generated_tokens']} tokens for {stats['prompts']} prompts in "
+                  f"{stats['batches']} batches ({stats['tokens_per_second']:.1f} tokens/s)")
+        return results
+
+    def _print_summary_cache_stats(self):
+        """Print summary cache hits, misses and evictions, if the cache is enabled and was used"""
+        if not self.summary_cache:
+            return
+        stats = self.summary_cache.stats()
+        if stats['hits'] + stats['misses']:
+            print(f"Summary cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_ratio']:.0%}), "
+                  f"{stats['expired']} expired, {stats['evictions']} evicted, {stats['entries']} entries")
+
+    def _save_daemon_result(self, meeting, result):
+        """Write a summary produced by the daemon to DAEMON_OUTPUT_DIR/<event id>.json"""
+        output_dir = os.getenv('DAEMON_OUTPUT_DIR', 'summaries')
+        os.makedirs(output_dir, exist_ok=True)
+        filename = re.sub(r'[^A-Za-z0-9_-]', '_', meeting['id']) + '.json'
+        with open(os.path.join(output_dir, filename), 'w') as f:
+            json.dump(result, f, indent=4)
+        print(f"Summary ready for {meeting.get('summary', 'No subject')} ({meeting.get('start')})")
+        self._print_summary_cache_stats()
+
+    def run_daemon(self, workers=None):
+        """Run until interrupted, generating each summary DAEMON_LEAD_MINUTES before its meeting"""
+        if os.getenv('AI_MODEL_WARMUP', 'true').lower() == 'true':
+            self.warmup()
+
+        workers = workers or int(os.getenv('MEETING_WORKERS', 1))
+        self._size_context_pool(workers)
+        self.daemon = MeetingDaemon(
+            lambda: self.get_meeting_details(days=int(os.getenv('DAEMON_HORIZON_DAYS', 1))),
+            self._process_meeting_for_daemon,
+            on_result=self._save_daemon_result,
+            workers=workers
+        )
+        status_port = int(os.getenv('DAEMON_STATUS_PORT', 0))
+        if status_port:
+            self.daemon.serve_status(status_port)
+            print(f"Daemon status at http://localhost:{status_port}/status")
+
+        ingestion = self._start_push_ingestion()
+        try:
+            self.daemon.run_forever()
+        except KeyboardInterrupt:
+            self.daemon.stop()
+        finally:
+            if ingestion:
+                ingestion.stop()
+
+    def _start_push_ingestion(self):
+        """Re-read calendars and index Slack messages as soon as changes are pushed, if PUSH_ENABLED"""
+        config = Config()
+        if not config.push_config['enabled']:
+            return None
+
+        bus = EventBus()
+        bus.subscribe(CALENDAR_CHANGED, lambda event: self.daemon.request_refresh())
+        slack_app_token = None
+        if self.slack_index and config.collaboration_config['slack_app_token']:
+            slack_app_token = config.collaboration_config['slack_app_token']
+            bus.subscribe(SLACK_MESSAGE, lambda event: self.slack_index.push_message(event['channel'],
+                                                                                     event['message']))
+
+        ingestion = PushIngestion(bus, config.push_config)
+        started = ingestion.start(
+            google_service=getattr(self, 'google_service', None),
+            ms_headers=getattr(self, 'ms_headers', None),
+            slack_app_token=slack_app_token,
+            slack_client=self.slack_client
+        )
+        # Polling continues at DAEMON_REFRESH_SECONDS as a fallback for missed notifications
+        print(f"Push ingestion started: {', '.join(started) or 'no sources'}")
+        return ingestion
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Process and summarize upcoming meetings')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of meetings to process concurrently (default: MEETING_WORKERS or 1)')
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running and generate each summary shortly before its meeting starts')
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Summarise all meetings as one OpenAI or Anthropic batch job (for nightly runs)')
+    args = parser.parse_args()
+
     automation = MeetingAutomation()
-    results = automation.run()
-    
-    # Save results to a JSON file
-    with open('meeting_summary.json', 'w') as f:
-        json.dump(results, f, indent=4)
-    
-    print("Meeting processing complete. Results saved to meeting_summary.json")
+    if args.daemon:
+        automation.run_daemon(workers=args.workers)
+    else:
+        results = automation.run(workers=args.workers, batch=args.batch)
+        
+        # Save results to a JSON file
+        with open('meeting_summary.json', 'w') as f:
+            json.dump(results, f, indent=4)
+        
+        print("Meeting processing complete. Results saved to meeting_summary.json")
@@ -0,0 +1,156 @@
+"""
+Local stub of the OpenAI Batch and Anthropic Message Batches APIs.
+
+Implements just enough of both APIs for the batch mode of
+MeetingAutomation.run and SummaryService to be exercised without real
+credentials. Each batch reports in progress for the first --polls status
+requests, then completes with one canned summary per request.
+
+Usage:
+    python scripts/batch_stub_server.py [--port 8089] [--polls 1]
+
+    OPENAI_BASE_URL=http://localhost:8089/v1 \
+    ANTHROPIC_BASE_URL=http://localhost:8089 \
+    BATCH_POLL_INTERVAL=1 python meeting_automation.py --batch
+"""
+
+import re
+import json
+import uuid
+import argparse
+from email.parser import BytesParser
+from email.policy import default
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FILES = {}
+BATCHES = {}
+POLLS_BEFORE_DONE = 1
+
+
+def stub_summary(prompt):
+    """A recognisable canned summary for a prompt"""
+    first_line = next((line for line in prompt.splitlines() if line.strip()), '')
+    return f"Stub summary: {first_line[:80]}"
+
+
+def parse_multipart(content_type, body):
+    """Return the form fields and uploaded file contents of a multipart body"""
+    message = BytesParser(policy=default).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    fields = {}
+    for part in message.iter_parts():
+        fields[part.get_param('name', header='content-disposition')] = part.get_payload(decode=True)
+    return fields
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def _send(self, status, payload, content_type='application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _advance(self, batch):
+        """Count a status poll; returns True once the batch should report completion"""
+        batch['polls'] += 1
+        return batch['polls'] > POLLS_BEFORE_DONE
+
+    def do_POST(self):
+        if self.path == '/v1/files':
+            fields = parse_multipart(self.headers['Content-Type'], self._body())
+            file_id = f"file-{uuid.uuid4().hex[:12]}"
+            FILES[file_id] = fields['file'].decode()
+            return self._send(200, {'id': file_id, 'object': 'file', 'purpose': 'batch'})
+
+        if self.path == '/v1/batches':
+            request = json.loads(self._body())
+            batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+            lines = [json.loads(line) for line in FILES[request['input_file_id']].splitlines() if line.strip()]
+            output = [
+                json.dumps({
+                    'custom_id': line['custom_id'],
+                    'response': {'status_code': 200, 'body': {'choices': [
+                        {'message': {'role': 'assistant',
+                                     'content': stub_summary(line['body']['messages'][-1]['content'])}}
+                    ]}},
+                    'error': None
+                })
+                for line in lines
+            ]
+            output_file_id = f"file-{uuid.uuid4().hex[:12]}"
+            FILES[output_file_id] = '\n'.join(output)
+            BATCHES[batch_id] = {'kind': 'openai', 'polls': 0, 'output_file_id': output_file_id}
+            return self._send(200, {'id': batch_id, 'object': 'batch', 'status': 'validating'})
+
+        if self.path == '/v1/messages/batches':
+            request = json.loads(self._body())
+            batch_id = f"msgbatch_{uuid.uuid4().hex[:12]}"
+            results = [
+                json.dumps({
+                    'custom_id': item['custom_id'],
+                    'result': {'type': 'succeeded', 'message': {'content': [
+                        {'type': 'text', 'text': stub_summary(item['params']['messages'][-1]['content'])}
+                    ]}}
+                })
+                for item in request['requests']
+            ]
+            BATCHES[batch_id] = {'kind': 'anthropic', 'polls': 0, 'results': '\n'.join(results)}
+            return self._send(200, {'id': batch_id, 'type': 'message_batch', 'processing_status': 'in_progress'})
+
+        self._send(404, {'error': {'message': f"Unknown path {self.path}"}})
+
+    def do_GET(self):
+        match = re.fullmatch(r'/v1/files/([^/]+)/content', self.path)
+        if match and match.group(1) in FILES:
+            return self._send(200, FILES[match.group(1)].encode(), 'application/jsonl')
+
+        match = re.fullmatch(r'/v1/batches/([^/]+)', self.path)
+        if match and match.group(1) in BATCHES:
+            batch = BATCHES[match.group(1)]
+            done = self._advance(batch)
+            return self._send(200, {
+                'id': match.group(1),
+                'object': 'batch',
+                'status': 'completed' if done else 'in_progress',
+                'output_file_id': batch['output_file_id'] if done else None,
+                'error_file_id': None
+            })
+
+        match = re.fullmatch(r'/v1/messages/batches/([^/]+)/results', self.path)
+        if match and match.group(1) in BATCHES:
+            return self._send(200, BATCHES[match.group(1)]['results'].encode(), 'application/x-jsonl')
+
+        match = re.fullmatch(r'/v1/messages/batches/([^/]+)', self.path)
+        if match and match.group(1) in BATCHES:
+            done = self._advance(BATCHES[match.group(1)])
+            host = self.headers.get('Host', f"localhost:{self.server.server_port}")
+            return self._send(200, {
+                'id': match.group(1),
+                'type': 'message_batch',
+                'processing_status': 'ended' if done else 'in_progress',
+                'results_url': f"http://{host}{self.path}/results" if done else None
+            })
+
+        self._send(404, {'error': {'message': f"Unknown path {self.path}"}})
+
+
+def main():
+    global POLLS_BEFORE_DONE
+    parser = argparse.ArgumentParser(description='Stub OpenAI and Anthropic batch API server')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--polls', type=int, default=1, help='Status polls before a batch completes')
+    args = parser.parse_args()
+    POLLS_BEFORE_DONE = args.polls
+
+    server = ThreadingHTTPServer(('localhost', args.port), StubHandler)
+    print(f"Batch stub listening on http://localhost:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+HuggingFace backend benchmark.
+
+Loads the model configured by HUGGINGFACE_MODEL with each backend
+(pytorch fp32, int8 dynamic quantisation, ONNX Runtime) in a separate
+process and reports load time, generation latency, tokens per second and
+peak RSS, so the backends can be compared on the same host.
+
+Usage:
+    python scripts/benchmark_hf_backends.py [--backends pytorch int8 onnx] [--prompts 8]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROMPT = (
+    "Summarize the following meeting notes in three bullet points:\n"
+    "The team reviewed the Q3 roadmap, agreed to move the billing migration to October, "
+    "and asked Dana to draft the rollout plan before the next sync."
+)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_backend(backend, prompts):
+    """Load one backend in this process, generate and print the measurements as JSON"""
+    os.environ['DEFAULT_AI_MODEL'] = 'huggingface'
+    os.environ['HUGGINGFACE_BACKEND'] = backend
+    sys.path.insert(0, ROOT)
+    from src.config.config import Config
+    from src.models.ai_models import HuggingFaceModel
+
+    started = time.perf_counter()
+    model = HuggingFaceModel(Config().model_config)
+    load_seconds = time.perf_counter() - started
+
+    # One warm-up prompt so lazy initialisation is not counted as latency
+    model.generate_batch([PROMPT])
+    model.stats.update(prompts=0, batches=0, generated_tokens=0, seconds=0.0)
+
+    started = time.perf_counter()
+    model.generate_batch([PROMPT] * prompts)
+    elapsed = time.perf_counter() - started
+
+    stats = model.throughput()
+    print(json.dumps({
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'latency_seconds': elapsed / prompts,
+        'tokens_per_second': stats['tokens_per_second'],
+        'peak_rss_mb': peak_rss_mb()
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare HuggingFace inference backends')
+    parser.add_argument('--backends', nargs='+', default=['pytorch', 'int8', 'onnx'],
+                        help='Backends to benchmark')
+    parser.add_argument('--prompts', type=int, default=8, help='Prompts generated per backend')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_backend(args.worker, args.prompts)
+        return
+
+    print(f"{'backend':<10} {'load s':>8} {'latency s':>10} {'tokens/s':>9} {'peak RSS MB':>12}")
+    for backend in args.backends:
+        # A fresh process per backend keeps peak RSS from one load out of the next
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', backend, '--prompts', str(args.prompts)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            print(f"{backend:<10} failed: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'unknown error'}")
+            continue
+        row = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{backend:<10} {row['load_seconds']:>8.1f} {row['latency_seconds']:>10.2f} "
+              f"{row['tokens_per_second']:>9.1f} {row['peak_rss_mb']:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Import-time budget check.
+
+Runs `python -X importtime` on the CLI entry points and fails if importing
+them takes longer than the budget or pulls in an AI / collaboration SDK
+that should only be loaded once its provider is selected.
+
+Usage:
+    python scripts/check_import_time.py [module ...]
+"""
+
+import os
+import subprocess
+import sys
+
+DEFAULT_MODULES = ['meeting_automation', 'src.main', 'src.services.summary_service']
+
+# SDKs that must not be imported until their provider is selected
+LAZY_MODULES = [
+    'openai', 'anthropic', 'google.generativeai', 'cohere', 'transformers',
+    'torch', 'azure.ai.ml', 'boto3', 'sagemaker', 'pandas', 'exchangelib',
+    'webexteamssdk', 'msal'
+]
+
+BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', 500))
+
+
+def measure(module):
+    """Return (cumulative import time in ms, imported module names) for a module"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=root,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    total_us = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.add(name.strip())
+        # Top-level imports are not indented, so their times add up to the total
+        if not name.startswith('  '):
+            total_us += int(cumulative)
+    return total_us / 1000, imported
+
+
+def main():
+    modules = sys.argv[1:] or DEFAULT_MODULES
+    failed = False
+
+    for module in modules:
+        total_ms, imported = measure(module)
+        eager = sorted(name for name in LAZY_MODULES if name in imported)
+        status = 'OK'
+        if total_ms > BUDGET_MS or eager:
+            status = 'FAIL'
+            failed = True
+        print(f"{status} {module}: {total_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)")
+        if eager:
+            print(f"    eagerly imported: {', '.join(eager)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,7 @@ Handles all environment variables and configuration settings.
 """
 
 import os
+import secrets
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -35,6 +36,16 @@ class Config:
         self.ai_model = os.getenv('DEFAULT_AI_MODEL', 'openai').lower()
         self.model_config = self._get_ai_model_config()
         
+        # Providers to hedge against and fail over to, in order of preference
+        self.fallback_models = [name.strip().lower() for name in os.getenv('AI_MODEL_FALLBACKS', '').split(',')
+                                if name.strip() and name.strip().lower() != self.ai_model]
+        self.hedge_percentile = float(os.getenv('AI_HEDGE_PERCENTILE', 95))
+        self.hedge_min_samples = int(os.getenv('AI_HEDGE_MIN_SAMPLES', 20))
+        self.hedge_initial_delay = float(os.getenv('AI_HEDGE_INITIAL_DELAY', 10))
+        
+        # Load models at startup instead of on the first request
+        self.model_warmup = os.getenv('AI_MODEL_WARMUP', 'true').lower() == 'true'
+        
         # Calendar Configuration
         self.calendar_config = self._get_calendar_config()
         
@@ -48,9 +59,25 @@ class Config:
         self.include_key_points = os.getenv('INCLUDE_KEY_POINTS', 'true').lower() == 'true'
         self.include_decisions = os.getenv('INCLUDE_DECISIONS', 'true').lower() == 'true'
         
-    def _get_ai_model_config(self):
-        """Get configuration for the selected AI model"""
-        model_type = self.ai_model
+        # Map-reduce summarisation for oversized context
+        # Defaults to the packing budget, so context is never cut down to fit it instead of summarised
+        self.map_reduce_threshold = int(os.getenv('SUMMARY_MAP_REDUCE_THRESHOLD',
+                                                  os.getenv('CONTEXT_TOKEN_BUDGET', 6000)))
+        self.summary_chunk_tokens = int(os.getenv('SUMMARY_CHUNK_TOKENS', 3000))
+        self.map_workers = int(os.getenv('SUMMARY_MAP_WORKERS', 4))
+        
+        # Summary Cache
+        self.summary_cache_enabled = os.getenv('SUMMARY_CACHE_ENABLED', 'true').lower() == 'true'
+        
+        # Near-duplicate context elimination
+        self.dedupe_enabled = os.getenv('DEDUPE_ENABLED', 'true').lower() == 'true'
+        
+        # Push ingestion from calendar webhooks and Slack Socket Mode
+        self.push_config = self._get_push_config()
+        
+    def _get_ai_model_config(self, model_type=None):
+        """Get configuration for the selected AI model, or for model_type if given"""
+        model_type = model_type or self.ai_model
         config = {}
         
         # Common settings
@@ -61,12 +88,32 @@ class Config:
         if model_type == 'openai':
             config['api_key'] = os.getenv('OPENAI_API_KEY')
             config['model'] = os.getenv('OPENAI_MODEL', 'gpt-4')
+            config['max_tokens'] = int(os.getenv('OPENAI_MAX_TOKENS', 2000))
         elif model_type == 'anthropic':
             config['api_key'] = os.getenv('ANTHROPIC_API_KEY')
             config['model'] = os.getenv('ANTHROPIC_MODEL', 'claude-3-sonnet-20240229')
+            config['max_tokens'] = int(os.getenv('ANTHROPIC_MAX_TOKENS', 2000))
+        elif model_type == 'huggingface':
+            config['api_key'] = os.getenv('HUGGINGFACE_API_KEY')
+            config['model'] = os.getenv('HUGGINGFACE_MODEL', 'meta-llama/Llama-2-70b-chat')
+            config['max_tokens'] = int(os.getenv('HUGGINGFACE_MAX_TOKENS', 2000))
+            config['temperature'] = float(os.getenv('HUGGINGFACE_TEMPERATURE', 0.7))
+            config['top_p'] = float(os.getenv('HUGGINGFACE_TOP_P', 0.9))
+            config['top_k'] = int(os.getenv('HUGGINGFACE_TOP_K', 40))
+            config['do_sample'] = os.getenv('HUGGINGFACE_DO_SAMPLE', 'true').lower() == 'true'
+            config['device'] = os.getenv('HUGGINGFACE_DEVICE', 'cpu')
+            config['backend'] = os.getenv('HUGGINGFACE_BACKEND', 'pytorch')
+            config['onnx_dir'] = os.getenv('HUGGINGFACE_ONNX_DIR')
+            config['batch_size'] = int(os.getenv('HUGGINGFACE_BATCH_SIZE', 8))
+            config['num_threads'] = int(os.getenv('HUGGINGFACE_NUM_THREADS', 0))
+            config['batch_max_wait_ms'] = int(os.getenv('HUGGINGFACE_BATCH_MAX_WAIT_MS', 50))
         
         return config
     
+    def get_model_config(self, model_type):
+        """Get configuration for any AI model type, e.g. a fallback provider"""
+        return self._get_ai_model_config(model_type.lower())
+    
     def _get_calendar_config(self):
         """Get calendar service configuration"""
         config = {}
@@ -98,3 +145,21 @@ class Config:
         config['teams_token'] = os.getenv('TEAMS_TOKEN')
         
         return config
+    
+    def _get_push_config(self):
+        """Get push ingestion configuration"""
+        config = {}
+        
+        config['enabled'] = os.getenv('PUSH_ENABLED', 'false').lower() == 'true'
+        config['host'] = os.getenv('PUSH_HOST', '0.0.0.0')
+        config['port'] = int(os.getenv('PUSH_PORT', 8090))
+        # HTTPS URL that Google and Microsoft can reach, forwarding to host:port
+        config['public_url'] = os.getenv('PUSH_PUBLIC_URL')
+        # Without a fixed secret, a fresh one is used for the channels created by this process
+        config['secret'] = os.getenv('PUSH_SECRET') or secrets.token_urlsafe(32)
+        config['channel_ttl'] = int(os.getenv('PUSH_CHANNEL_TTL_SECONDS', 86400))
+        config['graph_resources'] = [resource.strip() for resource in
+                                     os.getenv('GRAPH_SUBSCRIPTION_RESOURCES', 'me/events').split(',')
+                                     if resource.strip()]
+        
+        return config
@@ -21,6 +21,7 @@
 Main entry point for the Meeting Automation Assistant.
 """
 
+import os
 import argparse
 from src.services.meeting_service import MeetingService
 
@@ -40,6 +41,19 @@ def main():
         '--summary',
         action='store_true',
         help='Generate summary for a meeting')
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Process all upcoming meetings')
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='With --all, summarise every meeting as one OpenAI or Anthropic batch job')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=int(os.getenv('MEETING_WORKERS', 1)),
+        help='Number of meetings to process concurrently with --all')
     
     args = parser.parse_args()
     service = MeetingService()
@@ -53,11 +67,27 @@ def main():
             print(f"Attendees: {', '.join(meeting.get('attendees', []))}")
             print(f"ID: {meeting.get('id')}")
     
+    elif args.all:
+        meeting_ids = [meeting.get('id') for meeting in service.get_upcoming_meetings()]
+        results = service.process_meetings(meeting_ids, workers=args.workers, batch=args.batch)
+        for meeting_id, result in zip(meeting_ids, results):
+            print(f"\nMeeting {meeting_id}:")
+            print(result)
+        cache = service.summary_service.prompt_cache_report()
+        if cache.get('input_tokens'):
+            print(f"\nPrompt cache: {cache['cached_tokens']} of {cache['input_tokens']} input tokens cached "
+                  f"({cache['cached_ratio']:.0%})")
+        stats = service.summary_service.summary_cache_report()
+        if stats.get('hits') or stats.get('misses'):
+            print(f"Summary cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_ratio']:.0%}), "
+                  f"{stats['expired']} expired, {stats['evictions']} evicted, {stats['entries']} entries")
+    
     elif args.meeting_id:
         if args.summary:
-            result = service.get_meeting_summary(args.meeting_id)
             print("\nMeeting Summary:")
-            print(result.get('summary', 'Failed to generate summary'))
+            for chunk in service.stream_meeting_summary(args.meeting_id):
+                print(chunk, end='', flush=True)
+            print()
         else:
             result = service.process_meeting(args.meeting_id)
             print("\nMeeting Details:")
@@ -20,93 +20,655 @@
 """
 Factory and base class for AI models.
 Handles different AI providers and their configurations.
+
+Providers register themselves by name and import their SDK only when
+they are instantiated, so selecting one backend never loads the others.
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict, Optional
-import openai
-import anthropic
-import google.generativeai as genai
-import cohere
-from transformers import pipeline
-from azure.ai.ml import MLClient
-import boto3
+import os
 import json
+import time
+import queue
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+from src.config.config import Config
+
+# Provider name -> AIModel subclass, filled in by @register_provider
+PROVIDERS: Dict[str, Type['AIModel']] = {}
+
+def register_provider(name: str) -> Callable:
+    """Class decorator that makes an AIModel available to the factory"""
+    def decorator(cls):
+        PROVIDERS[name] = cls
+        return cls
+    return decorator
+
+class Prompt(str):
+    """Prompt text made of a stable prefix followed by per-request content
+    
+    It is an ordinary string (prefix, blank line, content) everywhere a
+    prompt is expected. Providers with prompt caching send the prefix as a
+    separate block so identical prefixes are served from the provider's
+    cache instead of being processed again.
+    """
+    
+    def __new__(cls, prefix: str, content: str):
+        prompt = super().__new__(cls, f"{prefix}\n\n{content}")
+        prompt.prefix = prefix
+        prompt.content = content
+        return prompt
+
+def output_schema(key_points: bool = True, decisions: bool = True, action_items: bool = True) -> str:
+    """The section layout every summary prompt asks for, as part of its stable prefix"""
+    schema = "\nUse exactly these sections, leaving out any that would be empty:\n"
+    if key_points:
+        schema += "Key Points:\n- <one line per point>\n"
+    if decisions:
+        schema += "Decisions:\n- <decision> (<implication>)\n"
+    if action_items:
+        schema += "Action Items:\n- <owner>: <task> (<due date if known>)\n"
+    return schema
+
+def split_prompt(prompt: str):
+    """Return (system text, user text), moving a Prompt's stable prefix into the system text"""
+    if isinstance(prompt, Prompt):
+        return f"{SYSTEM_PROMPT}\n\n{prompt.prefix}", prompt.content
+    return SYSTEM_PROMPT, str(prompt)
+
+def _field(obj, name: str, default=0):
+    """Read a usage field from an SDK object or a raw JSON dict"""
+    if obj is None:
+        return default
+    if isinstance(obj, dict):
+        value = obj.get(name, default)
+    else:
+        value = getattr(obj, name, default)
+    return default if value is None else value
+
+class CacheUsage:
+    """Counts input tokens and the share of them served from the provider's prompt cache"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.cache_write_tokens = 0
+        self._lock = threading.Lock()
+        
+    def record(self, input_tokens: int, cached_tokens: int, cache_write_tokens: int = 0):
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += input_tokens
+            self.cached_tokens += cached_tokens
+            self.cache_write_tokens += cache_write_tokens
+    
+    def record_openai(self, usage):
+        """Record an OpenAI usage block; prompt_tokens already includes cached tokens"""
+        details = _field(usage, 'prompt_tokens_details', None)
+        self.record(_field(usage, 'prompt_tokens'), _field(details, 'cached_tokens'))
+    
+    def record_anthropic(self, usage):
+        """Record an Anthropic usage block; input_tokens excludes cache reads and writes"""
+        cached = _field(usage, 'cache_read_input_tokens')
+        written = _field(usage, 'cache_creation_input_tokens')
+        self.record(_field(usage, 'input_tokens') + cached + written, cached, written)
+    
+    def report(self) -> Dict:
+        with self._lock:
+            report = {
+                'requests': self.requests,
+                'input_tokens': self.input_tokens,
+                'cached_tokens': self.cached_tokens,
+                'cache_write_tokens': self.cache_write_tokens
+            }
+        report['cached_ratio'] = report['cached_tokens'] / report['input_tokens'] if report['input_tokens'] else 0.0
+        return report
+
+SYSTEM_PROMPT = "You are a professional meeting assistant."
 
 class AIModel(ABC):
     """Base class for AI models"""
     
+    # Set by providers that report prompt-cache usage
+    cache_usage: Optional[CacheUsage] = None
+    
+    def cache_report(self) -> Dict:
+        """Input and cached prompt token counts reported by the provider so far"""
+        return self.cache_usage.report() if self.cache_usage else {}
+    
     @abstractmethod
     def generate(self, prompt: str) -> str:
         """Generate text based on prompt"""
         pass
+    
+    async def agenerate(self, prompt: str) -> str:
+        """Generate text without blocking the event loop"""
+        return await asyncio.to_thread(self.generate, prompt)
+    
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield generated text as it arrives (all at once unless overridden)"""
+        yield self.generate(prompt)
 
+@register_provider('openai')
 class OpenAIModel(AIModel):
     """OpenAI model implementation"""
     
     def __init__(self, config: Dict):
-        openai.api_key = config['api_key']
+        import openai
+        self.client = openai.OpenAI(api_key=config['api_key'])
+        self.async_client = openai.AsyncOpenAI(api_key=config['api_key'])
         self.model = config['model']
+        self.max_tokens = config.get('max_tokens')
+        self.cache_usage = CacheUsage()
         
-    def generate(self, prompt: str) -> str:
-        response = openai.ChatCompletion.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a professional meeting assistant."},
-                {"role": "user", "content": prompt}
+    def _request(self, prompt: str) -> Dict:
+        """Build the chat completion arguments for a prompt
+        
+        The stable prefix goes first, in the system message, so OpenAI's
+        automatic prefix caching can reuse it across requests.
+        """
+        system, content = split_prompt(prompt)
+        return {
+            'model': self.model,
+            'max_tokens': self.max_tokens,
+            'messages': [
+                {"role": "system", "content": system},
+                {"role": "user", "content": content}
             ]
-        )
+        }
+        
+    def generate(self, prompt: str) -> str:
+        response = self.client.chat.completions.create(**self._request(prompt))
+        self.cache_usage.record_openai(response.usage)
         return response.choices[0].message.content
+    
+    async def agenerate(self, prompt: str) -> str:
+        response = await self.async_client.chat.completions.create(**self._request(prompt))
+        self.cache_usage.record_openai(response.usage)
+        return response.choices[0].message.content
+    
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self.client.chat.completions.create(stream=True, **self._request(prompt)):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+# Prompt caching is still a beta feature for the pinned SDK version
+ANTHROPIC_CACHE_HEADERS = {'anthropic-beta': 'prompt-caching-2024-07-31'}
 
+@register_provider('anthropic')
 class AnthropicModel(AIModel):
     """Anthropic model implementation"""
     
     def __init__(self, config: Dict):
+        import anthropic
         self.client = anthropic.Anthropic(api_key=config['api_key'])
+        self.async_client = anthropic.AsyncAnthropic(api_key=config['api_key'])
         self.model = config['model']
+        self.max_tokens = config.get('max_tokens', 2000)
+        self.cache_usage = CacheUsage()
+        
+    def _request(self, prompt: str) -> Dict:
+        """Build the Messages API arguments for a prompt
+        
+        The system prompt and stable prefix form one system block marked
+        with cache_control, so later requests read it from the prompt cache.
+        """
+        system, content = split_prompt(prompt)
+        return {
+            'model': self.model,
+            'max_tokens': self.max_tokens,
+            'system': [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+            'messages': [{"role": "user", "content": content}],
+            'extra_headers': ANTHROPIC_CACHE_HEADERS
+        }
         
     def generate(self, prompt: str) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.content.text
+        response = self.client.messages.create(**self._request(prompt))
+        self.cache_usage.record_anthropic(response.usage)
+        return ''.join(block.text for block in response.content if block.type == 'text')
+    
+    async def agenerate(self, prompt: str) -> str:
+        response = await self.async_client.messages.create(**self._request(prompt))
+        self.cache_usage.record_anthropic(response.usage)
+        return ''.join(block.text for block in response.content if block.type == 'text')
+    
+    def stream(self, prompt: str) -> Iterator[str]:
+        with self.client.messages.stream(**self._request(prompt)) as response:
+            yield from response.text_stream
+            self.cache_usage.record_anthropic(response.get_final_message().usage)
 
+@register_provider('huggingface')
 class HuggingFaceModel(AIModel):
-    """HuggingFace model implementation"""
+    """HuggingFace model implementation
+    
+    Prompts passed to generate() from several threads are collected for up
+    to batch_max_wait_ms, grouped by length and run through the pipeline in
+    padded batches of batch_size, which keeps all CPU cores busy.
+    """
+    
+    # Optional generation settings passed through to the pipeline when configured
+    GENERATION_KEYS = ['temperature', 'top_p', 'top_k', 'repetition_penalty', 'do_sample',
+                       'num_beams', 'max_time']
     
     def __init__(self, config: Dict):
+        import torch
+        from transformers import AutoTokenizer, pipeline
+        
+        self.config = config
+        self.backend = config.get('backend', 'pytorch')
+        self.batch_size = config.get('batch_size', 8)
+        self.max_wait = config.get('batch_max_wait_ms', 50) / 1000
+        if config.get('num_threads'):
+            torch.set_num_threads(config['num_threads'])
+        
+        # Causal models need left padding so every prompt ends where generation starts
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            config['model'], token=config.get('api_key'), padding_side='left')
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        model = self._load_model()
         self.pipeline = pipeline(
             "text-generation",
-            model=config['model'],
-            use_auth_token=config['api_key']
+            model=model,
+            tokenizer=self.tokenizer,
+            # Quantised and ONNX models only run on CPU
+            device=config.get('device') if self.backend == 'pytorch' else 'cpu'
         )
         
-    def generate(self, prompt: str) -> str:
-        response = self.pipeline(
-            prompt,
-            max_new_tokens=config['max_tokens'],
-            temperature=config['temperature'],
-            top_p=config['top_p'],
-            top_k=config['top_k'],
-            do_sample=config['do_sample']
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'prompts': 0, 'batches': 0, 'generated_tokens': 0, 'seconds': 0.0}
+        
+    def _load_model(self):
+        """Load the model for the configured backend: pytorch (fp32), int8 or onnx"""
+        model_name = self.config['model']
+        token = self.config.get('api_key')
+        
+        if self.backend == 'onnx':
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForCausalLM
+            
+            options = onnxruntime.SessionOptions()
+            if self.config.get('num_threads'):
+                options.intra_op_num_threads = self.config['num_threads']
+            # Exporting takes minutes for large checkpoints, so it is done once and kept
+            onnx_dir = os.path.expanduser(self.config.get('onnx_dir') or os.path.join(
+                '~/.cache/huggingface/onnx', model_name.replace('/', '--')))
+            if os.path.exists(os.path.join(onnx_dir, 'config.json')):
+                return ORTModelForCausalLM.from_pretrained(
+                    onnx_dir,
+                    export=False,
+                    provider='CPUExecutionProvider',
+                    session_options=options
+                )
+            model = ORTModelForCausalLM.from_pretrained(
+                model_name,
+                token=token,
+                export=True,
+                provider='CPUExecutionProvider',
+                session_options=options
+            )
+            model.save_pretrained(onnx_dir)
+            print(f"Exported {model_name} to ONNX in {onnx_dir}")
+            return model
+        
+        import torch
+        from transformers import AutoModelForCausalLM
+        
+        model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            token=token,
+            low_cpu_mem_usage=True
         )
-        return response[0]['generated_text']
+        if self.backend == 'int8':
+            # Dynamic quantisation stores Linear weights as int8 and quantises activations on the fly
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif self.backend != 'pytorch':
+            raise ValueError(f"Unsupported HuggingFace backend: {self.backend}")
+        return model
+        
+    def _generation_kwargs(self) -> Dict:
+        """Build the pipeline generation arguments from the configuration"""
+        kwargs = {
+            'max_new_tokens': self.config.get('max_tokens', 512),
+            'return_full_text': False
+        }
+        for key in self.GENERATION_KEYS:
+            if key in self.config:
+                kwargs[key] = self.config[key]
+        return kwargs
+        
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Generate text for several prompts, batching prompts of similar length"""
+        order = sorted(range(len(prompts)), key=lambda i: len(self.tokenizer.encode(prompts[i])))
+        results = [None] * len(prompts)
+        
+        for start in range(0, len(order), self.batch_size):
+            group = order[start:start + self.batch_size]
+            started = time.perf_counter()
+            outputs = self.pipeline(
+                [prompts[i] for i in group],
+                batch_size=len(group),
+                **self._generation_kwargs()
+            )
+            elapsed = time.perf_counter() - started
+            
+            generated_tokens = 0
+            for i, output in zip(group, outputs):
+                results[i] = output[0]['generated_text']
+                generated_tokens += len(self.tokenizer.encode(results[i], add_special_tokens=False))
+            with self._stats_lock:
+                self.stats['prompts'] += len(group)
+                self.stats['batches'] += 1
+                self.stats['generated_tokens'] += generated_tokens
+                self.stats['seconds'] += elapsed
+        
+        return results
+        
+    def generate(self, prompt: str) -> str:
+        future = Future()
+        self._queue.put((prompt, future))
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_batches, name='hf-batcher', daemon=True)
+                self._worker.start()
+        return future.result()
+    
+    def _run_batches(self):
+        """Collect queued prompts for up to max_wait, then generate them together"""
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            # Gather a few batches' worth so prompts can be grouped by length
+            while len(pending) < self.batch_size * 4:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                outputs = self.generate_batch([prompt for prompt, _ in pending])
+                for (_, future), output in zip(pending, outputs):
+                    future.set_result(output)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+    
+    def throughput(self) -> Dict:
+        """Report prompts, batches and generated tokens per second so far"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['tokens_per_second'] = stats['generated_tokens'] / stats['seconds'] if stats['seconds'] else 0.0
+        return stats
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider"""
+    
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+        self.errors = 0
+        self._lock = threading.Lock()
+        
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+    
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the recorded latencies, or None without samples"""
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+    
+    def summary(self) -> Dict:
+        with self._lock:
+            count, errors = len(self.samples), self.errors
+        return {'count': count, 'errors': errors, 'p50': self.percentile(50), 'p95': self.percentile(95)}
+
+class HedgedModel(AIModel):
+    """Composite model that hedges slow requests and fails over across providers
+    
+    A request goes to the first provider. If it has not answered within that
+    provider's latency percentile (hedge_percentile, p95 by default), the same
+    prompt is sent to the next provider and whichever answers first wins. A
+    provider that raises is replaced by the next one straight away.
+    agenerate() cancels the losing request; generate() cannot interrupt a
+    running thread, so the loser finishes in the background and is ignored.
+    """
+    
+    def __init__(self, models: Dict[str, AIModel], hedge_percentile: float = 95,
+                 min_samples: int = 20, initial_delay: float = 10.0):
+        if not models:
+            raise ValueError("HedgedModel needs at least one provider")
+        self.models = models
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.latency = {name: LatencyTracker() for name in models}
+        self.executor = ThreadPoolExecutor(max_workers=len(models) * 4, thread_name_prefix='hedge')
+        
+    def _hedge_delay(self, name: str) -> float:
+        """Seconds to wait on a provider before hedging to the next one"""
+        tracker = self.latency[name]
+        if len(tracker.samples) < self.min_samples:
+            return self.initial_delay
+        return tracker.percentile(self.hedge_percentile)
+    
+    def _timed(self, name: str, prompt: str, started_at: Optional[Dict[str, float]] = None) -> str:
+        started = time.perf_counter()
+        if started_at is not None:
+            started_at[name] = started
+        try:
+            result = self.models[name].generate(prompt)
+        except Exception:
+            self.latency[name].record_error()
+            raise
+        self.latency[name].record(time.perf_counter() - started)
+        return result
+    
+    async def _atimed(self, name: str, prompt: str) -> str:
+        started = time.perf_counter()
+        try:
+            result = await self.models[name].agenerate(prompt)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.latency[name].record_error()
+            raise
+        self.latency[name].record(time.perf_counter() - started)
+        return result
+    
+    def generate(self, prompt: str) -> str:
+        return self.generate_with_provider(prompt)[0]
+    
+    def generate_with_provider(self, prompt: str) -> Tuple[str, str]:
+        """Generate like generate(), also returning the name of the provider that answered"""
+        candidates = list(self.models)
+        pending = {}
+        errors = {}
+        started_at = {}
+        last = None
+        
+        def launch():
+            nonlocal last
+            if candidates:
+                last = candidates.pop(0)
+                pending[self.executor.submit(self._timed, last, prompt, started_at)] = last
+        
+        launch()
+        while pending:
+            # Once every provider is running there is nothing left to hedge to
+            delay = None
+            if candidates:
+                # The hedge clock starts when the request does, so waiting for a thread
+                # under load does not hedge to another provider and add to the load
+                delay = self._hedge_delay(last)
+                if last in started_at:
+                    delay = max(0.0, started_at[last] + delay - time.perf_counter())
+            done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                if last in started_at:
+                    launch()
+                continue
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors[name] = e
+                    if not pending:
+                        launch()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                return result, name
+        
+        raise RuntimeError(f"All AI providers failed: {errors}")
+    
+    async def agenerate(self, prompt: str) -> str:
+        candidates = list(self.models)
+        pending = {}
+        errors = {}
+        last = None
+        
+        def launch():
+            nonlocal last
+            if candidates:
+                last = candidates.pop(0)
+                pending[asyncio.ensure_future(self._atimed(last, prompt))] = last
+        
+        launch()
+        try:
+            while pending:
+                delay = self._hedge_delay(last) if candidates else None
+                done, _ = await asyncio.wait(pending, timeout=delay,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch()
+                    continue
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is not None:
+                        errors[name] = task.exception()
+                        if not pending:
+                            launch()
+                        continue
+                    return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        raise RuntimeError(f"All AI providers failed: {errors}")
+    
+    def stream(self, prompt: str, on_provider: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+        """Stream from the first provider that starts answering, failing over on errors
+        
+        on_provider, if given, is called with the name of the provider whose output is streamed.
+        """
+        errors = {}
+        for name, model in self.models.items():
+            started = False
+            try:
+                for chunk in model.stream(prompt):
+                    if not started and on_provider:
+                        on_provider(name)
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                # Output already sent cannot be taken back, so only fail over before it starts
+                if started:
+                    raise
+                self.latency[name].record_error()
+                errors[name] = e
+        raise RuntimeError(f"All AI providers failed: {errors}")
+    
+    def cache_report(self) -> Dict:
+        """Prompt-cache token counts summed across providers"""
+        totals = CacheUsage()
+        for model in self.models.values():
+            report = model.cache_report()
+            if report:
+                totals.requests += report['requests']
+                totals.input_tokens += report['input_tokens']
+                totals.cached_tokens += report['cached_tokens']
+                totals.cache_write_tokens += report['cache_write_tokens']
+        return totals.report() if totals.requests else {}
+    
+    def latency_report(self) -> Dict[str, Dict]:
+        """Per-provider sample count, error count and p50/p95 latency in seconds"""
+        return {name: tracker.summary() for name, tracker in self.latency.items()}
 
 class AIModelFactory:
-    """Factory for creating AI models"""
+    """Factory for creating AI models
+    
+    Instances are cached for the life of the process, keyed by provider and
+    configuration, so model weights, SDK clients and their HTTP connection
+    pools are created once and shared by every caller.
+    """
+    
+    _models: Dict[str, AIModel] = {}
+    _lock = threading.Lock()
+    load_times: Dict[str, float] = {}
     
     @staticmethod
-    def get_model(model_type: str) -> AIModel:
-        """Create an AI model instance based on type"""
+    def cache_key(model_type: str, config: Dict) -> str:
+        """Build the cache key for a provider and its configuration"""
+        return f"{model_type}:{json.dumps(config, sort_keys=True, default=str)}"
+    
+    @classmethod
+    def get_model(cls, model_type: str) -> AIModel:
+        """Get the shared AI model instance for a type, creating it on first use"""
         model_type = model_type.lower()
-        config = Config().model_config
-        
-        if model_type == 'openai':
-            return OpenAIModel(config)
-        elif model_type == 'anthropic':
-            return AnthropicModel(config)
-        elif model_type == 'huggingface':
-            return HuggingFaceModel(config)
-        else:
+        if model_type not in PROVIDERS:
             raise ValueError(f"Unsupported AI model type: {model_type}")
+            
+        config = Config().get_model_config(model_type)
+        key = cls.cache_key(model_type, config)
+        with cls._lock:
+            if key not in cls._models:
+                started = time.perf_counter()
+                cls._models[key] = PROVIDERS[model_type](config)
+                cls.load_times[model_type] = time.perf_counter() - started
+            return cls._models[key]
+    
+    @classmethod
+    def get_failover_model(cls, model_type: str, fallback_types: List[str]) -> AIModel:
+        """Get a model that hedges and fails over from model_type to fallback_types
+        
+        Returns the plain model when there are no fallbacks.
+        """
+        if not fallback_types:
+            return cls.get_model(model_type)
+        
+        config = Config()
+        models = {name: cls.get_model(name) for name in [model_type] + fallback_types}
+        return HedgedModel(
+            models,
+            hedge_percentile=config.hedge_percentile,
+            min_samples=config.hedge_min_samples,
+            initial_delay=config.hedge_initial_delay
+        )
+    
+    @classmethod
+    def warmup(cls, model_types: List[str]) -> Dict[str, float]:
+        """Load models ahead of the first request and report load times in seconds"""
+        for model_type in model_types:
+            cls.get_model(model_type)
+            print(f"Loaded {model_type} model in {cls.load_times[model_type]:.2f}s")
+        return dict(cls.load_times)
@@ -0,0 +1,284 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Offline bulk summarisation through the OpenAI Batch and Anthropic Message
+Batches APIs.
+All prompts are submitted as one job, the job ID is persisted so an
+interrupted run resumes polling instead of resubmitting, and results are
+returned keyed by the custom ID each prompt was submitted with. Base URLs
+are configurable so the flow can run against scripts/batch_stub_server.py.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional
+import requests
+from src.models.ai_models import ANTHROPIC_CACHE_HEADERS, CacheUsage, split_prompt
+
+BATCH_PROVIDERS = ('openai', 'anthropic')
+
+
+def prompt_hash(prompt: str) -> str:
+    """Fingerprint of a prompt, stored with a job so it is only resumed for the same prompts"""
+    return hashlib.sha256(str(prompt).encode('utf-8')).hexdigest()
+
+
+def make_custom_id(value: str, index: int) -> str:
+    """A custom ID both APIs accept (1-64 characters of [A-Za-z0-9_-])"""
+    custom_id = re.sub(r'[^A-Za-z0-9_-]', '_', str(value or ''))[:56]
+    return f"{index}-{custom_id}" if custom_id else str(index)
+
+
+class BatchJobFailed(Exception):
+    """Raised when a batch job ends without producing results"""
+
+
+class OpenAIBatchClient:
+    """Runs chat completions through the OpenAI Batch API"""
+
+    def __init__(self, config: Dict, session: Optional[requests.Session] = None):
+        self.base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1').rstrip('/')
+        self.config = config
+        self.session = session or requests.Session()
+        self.session.headers['Authorization'] = f"Bearer {config.get('api_key') or os.getenv('OPENAI_API_KEY')}"
+        self.cache_usage = CacheUsage()
+
+    def submit(self, prompts: Dict[str, str]) -> str:
+        """Upload the prompts as a JSONL file and create a batch; returns the batch ID"""
+        lines = []
+        for custom_id, prompt in prompts.items():
+            system, content = split_prompt(prompt)
+            lines.append(json.dumps({
+                'custom_id': custom_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': {
+                    'model': self.config['model'],
+                    'max_tokens': self.config.get('max_tokens'),
+                    'messages': [
+                        {'role': 'system', 'content': system},
+                        {'role': 'user', 'content': content}
+                    ]
+                }
+            }))
+        upload = self.session.post(
+            f"{self.base_url}/files",
+            data={'purpose': 'batch'},
+            files={'file': ('meetings.jsonl', '\n'.join(lines).encode('utf-8'))}
+        )
+        upload.raise_for_status()
+
+        batch = self.session.post(f"{self.base_url}/batches", json={
+            'input_file_id': upload.json()['id'],
+            'endpoint': '/v1/chat/completions',
+            'completion_window': '24h'
+        })
+        batch.raise_for_status()
+        return batch.json()['id']
+
+    def poll(self, job_id: str) -> Optional[Dict]:
+        """Return None while the batch is running, else its results by custom ID"""
+        response = self.session.get(f"{self.base_url}/batches/{job_id}")
+        response.raise_for_status()
+        batch = response.json()
+        if batch['status'] in ('failed', 'expired', 'cancelled'):
+            raise BatchJobFailed(f"OpenAI batch {job_id} {batch['status']}")
+        if batch['status'] != 'completed':
+            return None
+
+        results = {}
+        for file_id in (batch.get('output_file_id'), batch.get('error_file_id')):
+            if not file_id:
+                continue
+            content = self.session.get(f"{self.base_url}/files/{file_id}/content")
+            content.raise_for_status()
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response_body = (item.get('response') or {}).get('body') or {}
+                if item.get('error') or 'choices' not in response_body:
+                    results[item['custom_id']] = BatchJobFailed(str(item.get('error') or response_body))
+                else:
+                    self.cache_usage.record_openai(response_body.get('usage'))
+                    results[item['custom_id']] = response_body['choices'][0]['message']['content']
+        return results
+
+
+class AnthropicBatchClient:
+    """Runs messages through the Anthropic Message Batches API"""
+
+    def __init__(self, config: Dict, session: Optional[requests.Session] = None):
+        self.base_url = os.getenv('ANTHROPIC_BASE_URL', 'https://api.anthropic.com').rstrip('/')
+        self.config = config
+        self.session = session or requests.Session()
+        self.session.headers.update({
+            'x-api-key': config.get('api_key') or os.getenv('ANTHROPIC_API_KEY') or '',
+            'anthropic-version': '2023-06-01',
+            **ANTHROPIC_CACHE_HEADERS
+        })
+        self.cache_usage = CacheUsage()
+
+    def _request(self, custom_id: str, prompt: str) -> Dict:
+        """One batch entry, with the stable prompt prefix marked for caching"""
+        system, content = split_prompt(prompt)
+        return {
+            'custom_id': custom_id,
+            'params': {
+                'model': self.config['model'],
+                'max_tokens': self.config.get('max_tokens', 2000),
+                'system': [{'type': 'text', 'text': system, 'cache_control': {'type': 'ephemeral'}}],
+                'messages': [{'role': 'user', 'content': content}]
+            }
+        }
+
+    def submit(self, prompts: Dict[str, str]) -> str:
+        """Create a message batch; returns the batch ID"""
+        response = self.session.post(f"{self.base_url}/v1/messages/batches", json={
+            'requests': [self._request(custom_id, prompt) for custom_id, prompt in prompts.items()]
+        })
+        response.raise_for_status()
+        return response.json()['id']
+
+    def poll(self, job_id: str) -> Optional[Dict]:
+        """Return None while the batch is running, else its results by custom ID"""
+        response = self.session.get(f"{self.base_url}/v1/messages/batches/{job_id}")
+        response.raise_for_status()
+        batch = response.json()
+        if batch['processing_status'] != 'ended':
+            return None
+        if not batch.get('results_url'):
+            raise BatchJobFailed(f"Anthropic batch {job_id} ended without results")
+
+        content = self.session.get(batch['results_url'])
+        content.raise_for_status()
+        results = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            result = item['result']
+            if result['type'] == 'succeeded':
+                self.cache_usage.record_anthropic(result['message'].get('usage'))
+                results[item['custom_id']] = ''.join(
+                    block['text'] for block in result['message']['content'] if block['type'] == 'text')
+            else:
+                results[item['custom_id']] = BatchJobFailed(str(result.get('error') or result['type']))
+        return results
+
+
+BATCH_CLIENTS = {
+    'openai': OpenAIBatchClient,
+    'anthropic': AnthropicBatchClient
+}
+
+
+class BatchJobStore:
+    """Persists the pending batch job so an interrupted run can resume it"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('BATCH_JOB_FILE', 'batch_job.json')
+
+    def load(self) -> Optional[Dict]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, job: Dict):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(job, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BatchRunner:
+    """Submits prompts as one batch job, waits for it and returns results by custom ID"""
+
+    def __init__(self, provider: str, config: Dict, store: Optional[BatchJobStore] = None):
+        if provider not in BATCH_CLIENTS:
+            raise ValueError(f"Batch mode is not supported for {provider}; use one of {', '.join(BATCH_PROVIDERS)}")
+        self.provider = provider
+        self.client = BATCH_CLIENTS[provider](config)
+        self.store = store or BatchJobStore()
+        self.poll_interval = float(os.getenv('BATCH_POLL_INTERVAL', 30))
+        self.timeout = float(os.getenv('BATCH_TIMEOUT', 24 * 3600))
+
+    def _job_for(self, prompts: Dict[str, str]) -> Dict:
+        """Resume the stored job if it ran these exact prompts, otherwise submit a new one"""
+        hashes = {custom_id: prompt_hash(prompt) for custom_id, prompt in prompts.items()}
+        job = self.store.load()
+        # Custom IDs repeat across runs (same meetings, same order), so match on the prompts themselves
+        if job and job['provider'] == self.provider and \
+                all(job.get('prompt_hashes', {}).get(custom_id) == digest for custom_id, digest in hashes.items()):
+            print(f"Resuming {self.provider} batch {job['id']}")
+            return job
+
+        job = {
+            'id': self.client.submit(prompts),
+            'provider': self.provider,
+            'custom_ids': list(prompts),
+            'prompt_hashes': hashes,
+            'submitted_at': datetime.now().isoformat()
+        }
+        self.store.save(job)
+        print(f"Submitted {len(prompts)} prompts as {self.provider} batch {job['id']}")
+        return job
+
+    def run(self, prompts: Dict[str, str]) -> Dict:
+        """Return each custom ID's generated text, or the exception it failed with"""
+        if not prompts:
+            return {}
+
+        job = self._job_for(prompts)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                results = self.client.poll(job['id'])
+            except BatchJobFailed:
+                self.store.clear()
+                raise
+            if results is not None:
+                break
+            if time.monotonic() >= deadline:
+                # The job stays in the store, so the next run picks it up again
+                raise TimeoutError(f"{self.provider} batch {job['id']} still running after {self.timeout:.0f}s")
+            time.sleep(self.poll_interval)
+
+        self.store.clear()
+        report = self.client.cache_usage.report()
+        if report['input_tokens']:
+            print(f"Batch prompt cache: {report['cached_tokens']} of {report['input_tokens']} "
+                  f"input tokens cached ({report['cached_ratio']:.0%})")
+        return {
+            custom_id: results.get(custom_id, BatchJobFailed(f"No result for {custom_id}"))
+            for custom_id in prompts
+        }
@@ -0,0 +1,234 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Incremental calendar synchronisation.
+Keeps a local event store up to date using Google Calendar sync tokens
+and Microsoft Graph calendarView delta links.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import requests
+from googleapiclient.errors import HttpError
+from src.services.pagination import iter_google_pages, iter_graph_pages
+
+GRAPH_DELTA_URL = 'https://graph.microsoft.com/v1.0/me/calendarView/delta'
+
+
+class SyncTokenExpired(Exception):
+    """Raised when a stored sync token or delta link is no longer valid"""
+
+
+def parse_event_time(value: str) -> Optional[datetime]:
+    """Parse a Google or Graph timestamp into an aware UTC datetime"""
+    if not value:
+        return None
+    value = value.replace('Z', '+00:00')
+    # Graph returns seven fractional digits, datetime accepts at most six
+    if '.' in value:
+        head, _, tail = value.partition('.')
+        digits = ''.join(c for c in tail if c.isdigit())
+        value = f"{head}.{digits[:6]}{tail[len(digits):]}"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _event_start(event: Dict) -> Optional[datetime]:
+    """Start of a stored event; all-day events start at midnight UTC on their date"""
+    return parse_event_time(event['start'] or event.get('start_date', ''))
+
+
+class CalendarSyncEngine:
+    """Applies calendar changes to a persistent local event store"""
+
+    def __init__(self, state_file: Optional[str] = None):
+        self.state_file = state_file or os.getenv('CALENDAR_SYNC_STATE_FILE', 'calendar_sync_state.json')
+        self.lookahead_days = int(os.getenv('CALENDAR_SYNC_LOOKAHEAD_DAYS', 7))
+        self._lock = threading.Lock()
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        """Load the event store and sync cursors from disk"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable calendar sync state: {e}")
+        return {}
+
+    def _save_state(self):
+        """Write the event store and sync cursors to disk"""
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def _reset(self, source: str, window_start: datetime, window_end: datetime) -> Dict:
+        """Drop the store for a source so the next sync is a full one"""
+        store = {
+            'events': {},
+            'window_start': window_start.isoformat(),
+            'window_end': window_end.isoformat()
+        }
+        self.state[source] = store
+        return store
+
+    def _get_store(self, source: str, days: int) -> Dict:
+        """Get the store for a source, resetting it if it does not cover the window"""
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(days=days)
+        window_end = now + timedelta(days=max(days, self.lookahead_days))
+        store = self.state.get(source)
+
+        if (not store
+                or parse_event_time(store['window_start']) > window_start
+                or parse_event_time(store['window_end']) < now + timedelta(days=days)):
+            store = self._reset(source, window_start, window_end)
+        return store
+
+    def _events_in_window(self, store: Dict, days: int) -> List[Dict]:
+        """Return stored events overlapping now +/- days, ordered by start"""
+        now = datetime.now(timezone.utc)
+        time_min = now - timedelta(days=days)
+        time_max = now + timedelta(days=days)
+        events = []
+
+        for event in store['events'].values():
+            start = _event_start(event)
+            if start is None:
+                continue
+            # All-day events end at midnight after their last day
+            end = parse_event_time(event['end'] or event.get('end_date', '')) or start
+            if start <= time_max and end >= time_min:
+                events.append(event)
+
+        return sorted(events, key=_event_start)
+
+    def sync_google(self, service, days: int = 1, calendar_id: str = 'primary') -> List[Dict]:
+        """Apply Google Calendar changes since the last sync and return events"""
+        with self._lock:
+            store = self._get_store('google', days)
+            try:
+                self._apply_google_changes(service, store, calendar_id)
+            except SyncTokenExpired:
+                print("Google Calendar sync token expired, running a full sync")
+                store = self._reset('google', parse_event_time(store['window_start']),
+                                    parse_event_time(store['window_end']))
+                self._apply_google_changes(service, store, calendar_id)
+
+            self._save_state()
+            return self._events_in_window(store, days)
+
+    def _apply_google_changes(self, service, store: Dict, calendar_id: str):
+        """Fetch all pages of changes since the stored sync token"""
+        params = {'calendarId': calendar_id, 'singleEvents': True}
+        if store.get('sync_token'):
+            params['syncToken'] = store['sync_token']
+        else:
+            # Bound the expansion of recurring events to the store window
+            params['timeMin'] = store['window_start']
+            params['timeMax'] = store['window_end']
+
+        sync_token = None
+        try:
+            for page in iter_google_pages(service.events().list, **params):
+                for event in page.get('items', []):
+                    if event.get('status') == 'cancelled':
+                        store['events'].pop(event['id'], None)
+                    else:
+                        store['events'][event['id']] = {
+                            'id': event['id'],
+                            'source': 'google',
+                            'summary': event.get('summary', ''),
+                            'description': event.get('description', ''),
+                            'start': event.get('start', {}).get('dateTime', ''),
+                            'end': event.get('end', {}).get('dateTime', ''),
+                            'start_date': event.get('start', {}).get('date', ''),
+                            'end_date': event.get('end', {}).get('date', ''),
+                            'updated': event.get('updated', '')
+                        }
+                # Only the last page carries the token for the next sync
+                sync_token = page.get('nextSyncToken')
+        except HttpError as e:
+            if e.resp.status == 410:
+                raise SyncTokenExpired() from e
+            raise
+
+        store['sync_token'] = sync_token
+
+    def sync_microsoft(self, headers: Dict, days: int = 1) -> List[Dict]:
+        """Apply Microsoft Graph calendar changes since the last sync and return events"""
+        with self._lock:
+            store = self._get_store('microsoft', days)
+            try:
+                self._apply_microsoft_changes(headers, store)
+            except SyncTokenExpired:
+                print("Microsoft Graph delta link expired, running a full sync")
+                store = self._reset('microsoft', parse_event_time(store['window_start']),
+                                    parse_event_time(store['window_end']))
+                self._apply_microsoft_changes(headers, store)
+
+            self._save_state()
+            return self._events_in_window(store, days)
+
+    def _apply_microsoft_changes(self, headers: Dict, store: Dict):
+        """Follow the stored delta link through all pages of changes"""
+        url = store.get('delta_link')
+        params = None
+        if not url:
+            url = GRAPH_DELTA_URL
+            params = {
+                'startDateTime': store['window_start'],
+                'endDateTime': store['window_end']
+            }
+
+        delta_link = None
+        try:
+            for page in iter_graph_pages(url, headers, params):
+                for event in page.get('value', []):
+                    if '@removed' in event:
+                        store['events'].pop(event['id'], None)
+                    else:
+                        store['events'][event['id']] = {
+                            'id': event['id'],
+                            'source': 'microsoft',
+                            'summary': event.get('subject', ''),
+                            'description': event.get('bodyPreview', ''),
+                            'start': event.get('start', {}).get('dateTime', ''),
+                            'end': event.get('end', {}).get('dateTime', ''),
+                            'updated': event.get('lastModifiedDateTime', '')
+                        }
+                # Only the last page carries the link for the next sync
+                delta_link = page.get('@odata.deltaLink')
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 410:
+                raise SyncTokenExpired() from e
+            raise
+
+        store['delta_link'] = delta_link
@@ -0,0 +1,198 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Token-budgeted context packing.
+Ranks gathered context items by relevance to the meeting and recency,
+then keeps the best items that fit each source's token budget.
+"""
+
+import os
+import math
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from src.services.retrieval import tokenize
+
+# Fields that hold the text of an item, across all context sources
+TEXT_FIELDS = ['subject', 'name', 'text', 'content']
+# Fields that hold the time of an item, across all context sources
+TIME_FIELDS = ['timestamp', 'date', 'modifiedTime', 'createdDateTime']
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(provider: str, model: str) -> Callable[[str], int]:
+    """
+    Get a function counting tokens with the model's tokenizer.
+    
+    Uses tiktoken for OpenAI and Azure models and the model's own tokenizer
+    for HuggingFace. Falls back to roughly four characters per token when
+    no tokenizer is available.
+    """
+    try:
+        if provider in ('openai', 'azure'):
+            import tiktoken
+            encoding = tiktoken.encoding_for_model(model)
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+        if provider == 'huggingface':
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(model)
+            return lambda text: len(tokenizer.encode(text))
+    except Exception as e:
+        print(f"Using approximate token counts, no tokenizer for {provider}/{model}: {e}")
+    return lambda text: max(1, len(text) // 4)
+
+
+def item_text(item: Dict) -> str:
+    """Get the searchable text of a context item"""
+    return ' '.join(str(item[field]) for field in TEXT_FIELDS if item.get(field))
+
+
+def render_item(item: Dict) -> str:
+    """Render a context item as the line it takes up in a summary prompt"""
+    return f"- {' '.join(item_text(item).split())}"
+
+
+def render_context(sources: Dict[str, List[Dict]]) -> str:
+    """Render packed context sources as the prompt section whose lines the packer counted"""
+    sections = []
+    for source, items in sources.items():
+        if items:
+            label = source.replace('_', ' ').capitalize()
+            sections.append(f"{label}:\n" + "\n".join(render_item(item) for item in items))
+    return "\n".join(sections)
+
+
+def item_time(item: Dict) -> Optional[float]:
+    """Get the time of a context item as a Unix timestamp"""
+    for field in TIME_FIELDS:
+        value = item.get(field)
+        if not value:
+            continue
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+        try:
+            return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(str(value)).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+class ContextPacker:
+    """Fills per-source token budgets with the most relevant, most recent items"""
+
+    def __init__(self, count_tokens: Callable[[str], int], budget: Optional[int] = None):
+        self.count_tokens = count_tokens
+        self.budget = budget or int(os.getenv('CONTEXT_TOKEN_BUDGET', 6000))
+        self.half_life_days = float(os.getenv('CONTEXT_RECENCY_HALF_LIFE_DAYS', 7))
+        self.relevance_weight = float(os.getenv('CONTEXT_RELEVANCE_WEIGHT', 0.7))
+
+    def score(self, item: Dict, query_terms: set, now: float) -> float:
+        """Combine term overlap with the query and an exponential recency decay"""
+        relevance = 0.0
+        if query_terms:
+            relevance = len(query_terms & set(tokenize(item_text(item)))) / len(query_terms)
+
+        recency = 0.0
+        timestamp = item_time(item)
+        if timestamp is not None:
+            age_days = max(0.0, now - timestamp) / 86400
+            recency = math.pow(0.5, age_days / self.half_life_days)
+
+        return self.relevance_weight * relevance + (1 - self.relevance_weight) * recency
+
+    def _source_budgets(self, needs: Dict[str, int]) -> Dict[str, int]:
+        """
+        Split the budget across sources.
+        
+        CONTEXT_BUDGET_<SOURCE> fixes a source's budget. The rest is shared
+        evenly, and budget a source does not need is passed on to the others.
+        """
+        budgets = {}
+        remaining = self.budget
+        shared = []
+        for source, need in needs.items():
+            fixed = os.getenv(f'CONTEXT_BUDGET_{source.upper()}')
+            if fixed is not None:
+                budgets[source] = int(fixed)
+                remaining -= int(fixed)
+            else:
+                shared.append(source)
+
+        shared.sort(key=lambda source: needs[source])
+        for position, source in enumerate(shared):
+            share = max(0, remaining) // (len(shared) - position)
+            budgets[source] = min(needs[source], share)
+            remaining -= budgets[source]
+        return budgets
+
+    def pack(self, query: str, sources: Dict[str, List[Dict]]) -> Tuple[Dict[str, List[Dict]], Dict]:
+        """
+        Keep the best items from each source within its token budget.
+        
+        Items are charged for the line render_item gives them in the prompt.
+        Returns the packed sources, with each source's items in their
+        original order, and a report of kept and dropped items per source.
+        """
+        now = time.time()
+        query_terms = set(tokenize(query))
+        tokens = {
+            source: [self.count_tokens(render_item(item)) for item in items]
+            for source, items in sources.items()
+        }
+        budgets = self._source_budgets({source: sum(counts) for source, counts in tokens.items()})
+
+        packed = {}
+        report = {'budget': self.budget, 'sources': {}, 'dropped': []}
+        for source, items in sources.items():
+            ranked = sorted(
+                range(len(items)),
+                key=lambda i: self.score(items[i], query_terms, now),
+                reverse=True
+            )
+            used = 0
+            kept = set()
+            for i in ranked:
+                if used + tokens[source][i] <= budgets[source]:
+                    kept.add(i)
+                    used += tokens[source][i]
+                else:
+                    report['dropped'].append({
+                        'source': source,
+                        'text': item_text(items[i])[:80],
+                        'tokens': tokens[source][i]
+                    })
+
+            packed[source] = [item for i, item in enumerate(items) if i in kept]
+            report['sources'][source] = {
+                'budget': budgets[source],
+                'tokens': used,
+                'kept': len(kept),
+                'dropped': len(items) - len(kept)
+            }
+
+        return packed, report
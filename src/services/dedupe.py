@@ -0,0 +1,187 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Near-duplicate elimination for gathered context.
+Items are fingerprinted with MinHash over word shingles and bucketed with
+locality-sensitive hashing, so quoted reply chains, announcements
+cross-posted to several channels and HTML copies of the same text collapse
+into the earliest item, which records how many copies were dropped.
+"""
+
+import os
+import re
+import html
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from src.services.context_packer import item_text, item_time
+
+# Mersenne-style prime above 2**32, so hashes of 32-bit shingle values stay distinct
+PRIME = 4294967311
+HTML_TAG = re.compile(r'<[^>]+>')
+# "On Mon, 3 Jun 2024 at 10:00, Alex <alex@example.com> wrote:" and Outlook's "-----Original Message-----"
+REPLY_HEADER = re.compile(r'^(on .+ wrote:|-+ ?original message ?-+)$', re.IGNORECASE)
+# Gmail's "---------- Forwarded message ---------" and Apple Mail's "Begin forwarded message:"
+FORWARD_MARKER = re.compile(r'^(-+ ?forwarded message ?-+|begin forwarded message:)$', re.IGNORECASE)
+HEADER_FIELD = re.compile(r'^(from|sent|date|to|cc|subject):', re.IGNORECASE)
+SEPARATOR = re.compile(r'^(_{5,}|-{5,})$')
+
+
+def _header_block(lines: List[str], index: int) -> Optional[str]:
+    """
+    Classify an Outlook header block (From:, then Sent: or Date:, and To:) starting at lines[index].
+    
+    Returns 'forward' when its subject is FW:/Fwd:, 'reply' otherwise, or
+    None when the line does not start such a block.
+    """
+    if not lines[index].lower().startswith('from:'):
+        return None
+    fields = {}
+    for line in lines[index + 1:index + 6]:
+        match = HEADER_FIELD.match(line)
+        if not match:
+            break
+        fields[match.group(1).lower()] = line
+    if not (('sent' in fields or 'date' in fields) and 'to' in fields):
+        return None
+    if re.match(r'subject:\s*(fw|fwd):', fields.get('subject', ''), re.IGNORECASE):
+        return 'forward'
+    return 'reply'
+
+
+def strip_quoted_history(text: str) -> str:
+    """
+    Remove the quoted earlier messages from an email reply.
+    
+    Forwarded messages are kept in full: unlike earlier messages in a
+    thread, they are not fetched on their own.
+    """
+    raw = text.splitlines()
+    stripped = [line.strip() for line in raw]
+    lines = []
+    for index, line in enumerate(stripped):
+        block = _header_block(stripped, index)
+        if FORWARD_MARKER.match(line) or block == 'forward':
+            lines.extend(raw[index:])
+            break
+        if REPLY_HEADER.match(line) or block == 'reply':
+            # Outlook puts a separator line above its header block
+            while lines and SEPARATOR.match(lines[-1].strip()):
+                lines.pop()
+            break
+        if not line.startswith('>'):
+            lines.append(raw[index])
+    return '\n'.join(lines).strip()
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase words of the text without HTML markup or quoted reply history"""
+    text = strip_quoted_history(html.unescape(HTML_TAG.sub(' ', text)))
+    return re.findall(r'\w+', text.lower())
+
+
+class MinHashDeduplicator:
+    """Collapses context items whose estimated Jaccard similarity reaches the threshold"""
+
+    def __init__(self, threshold: Optional[float] = None, num_perm: Optional[int] = None,
+                 bands: Optional[int] = None, shingle_size: int = 3):
+        self.threshold = threshold or float(os.getenv('DEDUPE_THRESHOLD', 0.8))
+        self.num_perm = num_perm or int(os.getenv('DEDUPE_NUM_PERM', 64))
+        self.bands = bands or int(os.getenv('DEDUPE_BANDS', 16))
+        if self.num_perm % self.bands:
+            raise ValueError("DEDUPE_NUM_PERM must be a multiple of DEDUPE_BANDS")
+        self.rows = self.num_perm // self.bands
+        self.shingle_size = shingle_size
+
+        # Fixed seed so fingerprints are comparable across runs
+        rng = np.random.RandomState(1)
+        self.a = rng.randint(1, 2 ** 31, size=self.num_perm).astype(np.uint64)
+        self.b = rng.randint(0, 2 ** 32, size=self.num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of the text's word shingles, or None for empty text"""
+        words = normalize(text)
+        if not words:
+            return None
+        size = min(self.shingle_size, len(words))
+        shingles = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+        values = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # One universal hash per permutation; a < 2**31 and values < 2**32 keep the product within uint64
+        hashed = (np.outer(self.a, values) + self.b[:, None]) % PRIME
+        return hashed.min(axis=1)
+
+    def _groups(self, items: List[Dict], text: Callable[[Dict], str]) -> Tuple[set, Dict[int, int]]:
+        """Indices of the items to keep, and how many copies each kept item absorbed"""
+        signatures = [self.signature(text(item)) for item in items]
+        # Earliest first; items without a time keep their order after the timed ones
+        order = sorted(range(len(items)), key=lambda i: (item_time(items[i]) is None, item_time(items[i]) or 0, i))
+
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        duplicates: Dict[int, int] = {}
+        kept = set()
+        for i in order:
+            signature = signatures[i]
+            if signature is None:
+                kept.add(i)
+                continue
+            keys = [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                    for band in range(self.bands)]
+            candidates = sorted({j for key in keys for j in buckets.get(key, [])})
+            match = next((j for j in candidates if np.mean(signatures[j] == signature) >= self.threshold), None)
+            if match is not None:
+                duplicates[match] = duplicates.get(match, 0) + 1
+                continue
+            kept.add(i)
+            for key in keys:
+                buckets.setdefault(key, []).append(i)
+        return kept, duplicates
+
+    @staticmethod
+    def _kept_item(item: Dict, count: int) -> Dict:
+        """The kept item, copied with a 'duplicates' count if it absorbed any"""
+        return {**item, 'duplicates': count} if count else item
+
+    def dedupe_items(self, items: List[Dict], text: Callable[[Dict], str] = item_text) -> Tuple[List[Dict], int]:
+        """
+        Drop near-duplicates, keeping the earliest item of each group.
+        
+        Returns the kept items in their original order and the number removed.
+        """
+        kept, duplicates = self._groups(items, text)
+        result = [self._kept_item(item, duplicates.get(i, 0)) for i, item in enumerate(items) if i in kept]
+        return result, len(items) - len(result)
+
+    def dedupe_sources(self, sources: Dict[str, List[Dict]]) -> Tuple[Dict[str, List[Dict]], Dict[str, int]]:
+        """
+        Drop near-duplicates across all sources, e.g. Teams copies of Slack text.
+        
+        Returns the deduplicated sources and the number removed per source.
+        """
+        flat = [(source, item) for source, items in sources.items() for item in items]
+        kept, duplicates = self._groups([item for _, item in flat], item_text)
+
+        result = {source: [] for source in sources}
+        removed = {source: 0 for source in sources}
+        for i, (source, item) in enumerate(flat):
+            if i in kept:
+                result[source].append(self._kept_item(item, duplicates.get(i, 0)))
+            else:
+                removed[source] += 1
+        return result, removed
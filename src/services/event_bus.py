@@ -0,0 +1,71 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+In-process event bus for pushed change notifications.
+Webhook handlers and socket listeners publish events and return at once;
+a dispatcher thread delivers them to the subscribed fetchers in order.
+"""
+
+import queue
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+# Topics published by the push ingestion
+CALENDAR_CHANGED = 'calendar.changed'
+GRAPH_CHANGED = 'graph.changed'
+SLACK_MESSAGE = 'slack.message'
+
+
+class EventBus:
+    """Publish/subscribe by topic, with delivery on a background thread"""
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Callable[[Dict], None]]] = defaultdict(list)
+        self.stats = defaultdict(int)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._dispatch, name='event-bus', daemon=True)
+        self._thread.start()
+
+    def subscribe(self, topic: str, handler: Callable[[Dict], None]):
+        with self._lock:
+            self.handlers[topic].append(handler)
+
+    def publish(self, topic: str, event: Dict):
+        """Queue an event for the topic's subscribers"""
+        self._queue.put((topic, event))
+
+    def _dispatch(self):
+        while True:
+            topic, event = self._queue.get()
+            with self._lock:
+                handlers = list(self.handlers.get(topic, []))
+                self.stats[topic] += 1
+            for handler in handlers:
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"Error handling {topic} event: {e}")
+            self._queue.task_done()
+
+    def join(self):
+        """Block until every published event has been delivered"""
+        self._queue.join()
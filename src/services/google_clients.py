@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Process-wide registry of Google API clients.
+Builds each service once from the bundled discovery documents and shares
+one credential object that is refreshed ahead of expiry.
+"""
+
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import httplib2
+import google_auth_httplib2
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+
+
+class GoogleClientRegistry:
+    """Thread-safe cache of Google API services sharing one credential"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, scopes: List[str], token_file: Optional[str] = None,
+                 credentials_file: Optional[str] = None):
+        self.scopes = scopes
+        self.token_file = token_file or os.getenv('GOOGLE_TOKEN_FILE', 'token.json')
+        self.credentials_file = credentials_file or os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json')
+        self.refresh_margin = timedelta(seconds=int(os.getenv('GOOGLE_TOKEN_REFRESH_MARGIN', 300)))
+        self._lock = threading.RLock()
+        self._creds = None
+        self._services: Dict = {}
+        self.metrics = {'builds': 0, 'build_seconds': {}, 'refreshes': 0}
+
+    @classmethod
+    def get_instance(cls, scopes: List[str]) -> 'GoogleClientRegistry':
+        """Get the registry shared by the whole process"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(scopes)
+            return cls._instance
+
+    def _needs_refresh(self, creds) -> bool:
+        """Check whether the token is invalid or expires within the margin"""
+        if not creds.valid:
+            return True
+        return creds.expiry is not None and creds.expiry - datetime.utcnow() < self.refresh_margin
+
+    def get_credentials(self):
+        """Get the shared credentials, refreshing them ahead of expiry"""
+        with self._lock:
+            if self._creds is None and os.path.exists(self.token_file):
+                self._creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+
+            if self._creds and not self._needs_refresh(self._creds):
+                return self._creds
+
+            if self._creds and self._creds.refresh_token:
+                self._creds.refresh(Request())
+                self.metrics['refreshes'] += 1
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, self.scopes)
+                self._creds = flow.run_local_server(port=0)
+            with open(self.token_file, 'w') as token:
+                token.write(self._creds.to_json())
+            return self._creds
+
+    def _build_request(self, http, *args, **kwargs):
+        """Give every request its own authorized connection; httplib2 is not thread-safe"""
+        authorized_http = google_auth_httplib2.AuthorizedHttp(self.get_credentials(), http=httplib2.Http())
+        return HttpRequest(authorized_http, *args, **kwargs)
+
+    def get_service(self, name: str, version: str):
+        """Get a Google API service, building it on first use"""
+        with self._lock:
+            key = (name, version)
+            if key not in self._services:
+                started = time.perf_counter()
+                self._services[key] = build(
+                    name,
+                    version,
+                    credentials=self.get_credentials(),
+                    requestBuilder=self._build_request,
+                    static_discovery=True,
+                    cache_discovery=False
+                )
+                self.metrics['builds'] += 1
+                self.metrics['build_seconds'][f'{name}/{version}'] = time.perf_counter() - started
+            return self._services[key]
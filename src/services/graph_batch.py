@@ -0,0 +1,129 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Microsoft Graph JSON batching.
+Packs up to 20 GET requests into each /$batch call, retries throttled
+sub-requests and follows @odata.nextLink for collection responses.
+"""
+
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+import requests
+
+GRAPH_ROOT = 'https://graph.microsoft.com/v1.0'
+GRAPH_BATCH_URL = f'{GRAPH_ROOT}/$batch'
+MAX_BATCH_SIZE = 20
+RETRYABLE_STATUS = {429, 503, 504}
+
+
+class GraphBatchClient:
+    """Runs Microsoft Graph GET requests through the JSON $batch endpoint"""
+
+    def __init__(self, headers: Dict, session: Optional[requests.Session] = None):
+        self.headers = headers
+        self.session = session or requests.Session()
+        self.max_retries = int(os.getenv('GRAPH_BATCH_MAX_RETRIES', 3))
+        self.stats = {'batches': 0, 'requests': 0, 'throttled': 0}
+
+    def _post_batch(self, urls: List[str]) -> Tuple[Dict[int, Dict], float]:
+        """Send one $batch call; returns responses by position and the longest Retry-After"""
+        body = {
+            'requests': [
+                {'id': str(i), 'method': 'GET', 'url': url}
+                for i, url in enumerate(urls)
+            ]
+        }
+        response = self.session.post(GRAPH_BATCH_URL, headers=self.headers, json=body)
+        self.stats['batches'] += 1
+
+        if response.status_code in RETRYABLE_STATUS:
+            # The whole batch was throttled, so every sub-request is retried
+            self.stats['throttled'] += len(urls)
+            return {}, float(response.headers.get('Retry-After', 1))
+        response.raise_for_status()
+
+        results = {}
+        retry_after = 0.0
+        for item in response.json().get('responses', []):
+            if item.get('status') in RETRYABLE_STATUS:
+                self.stats['throttled'] += 1
+                retry_after = max(retry_after, float(item.get('headers', {}).get('Retry-After', 1)))
+            else:
+                results[int(item['id'])] = item
+        return results, retry_after
+
+    def execute(self, urls: List[str]) -> List[Optional[Dict]]:
+        """
+        Run GET requests for Graph URLs relative to /v1.0 in batches of 20.
+        
+        Returns the sub-responses ({'status', 'headers', 'body'}) in input
+        order. A sub-request still throttled after GRAPH_BATCH_MAX_RETRIES
+        attempts is returned as None.
+        """
+        urls = [url[len(GRAPH_ROOT):] if url.startswith(GRAPH_ROOT) else url for url in urls]
+        self.stats['requests'] += len(urls)
+        responses: List[Optional[Dict]] = [None] * len(urls)
+        pending = list(range(len(urls)))
+
+        for attempt in range(self.max_retries + 1):
+            retry = []
+            delay = 0.0
+            for start in range(0, len(pending), MAX_BATCH_SIZE):
+                chunk = pending[start:start + MAX_BATCH_SIZE]
+                results, retry_after = self._post_batch([urls[i] for i in chunk])
+                for position, index in enumerate(chunk):
+                    if position in results:
+                        responses[index] = results[position]
+                    else:
+                        retry.append(index)
+                delay = max(delay, retry_after)
+
+            if not retry or attempt == self.max_retries:
+                break
+            time.sleep(delay)
+            pending = retry
+
+        return responses
+
+    def iter_collections(self, urls: List[str]) -> Iterator[Tuple[int, Dict]]:
+        """
+        Yield (url index, item) for every item of several Graph collections.
+        
+        Each round fetches the current page of up to 20 collections in one
+        $batch call, then queues their nextLinks for a later round.
+        """
+        pending = list(enumerate(urls))
+        while pending:
+            next_pending = []
+            for start in range(0, len(pending), MAX_BATCH_SIZE):
+                chunk = pending[start:start + MAX_BATCH_SIZE]
+                responses = self.execute([url for _, url in chunk])
+                for (index, url), response in zip(chunk, responses):
+                    if response is None or response.get('status') != 200:
+                        status = response.get('status') if response else 'throttled'
+                        print(f"Error fetching {url} in Graph batch: {status}")
+                        continue
+                    body = response.get('body', {})
+                    for item in body.get('value', []):
+                        yield index, item
+                    if body.get('@odata.nextLink'):
+                        next_pending.append((index, body['@odata.nextLink']))
+            pending = next_pending
@@ -0,0 +1,245 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Deadline-driven meeting daemon.
+Keeps upcoming meetings in a priority queue ordered by when their summary
+is due (start time minus a lead time), prefetches context and generates
+each summary before the meeting starts, and schedules a meeting again when
+the event changes.
+"""
+
+import os
+import json
+import heapq
+import hashlib
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from src.services.calendar_sync import parse_event_time
+
+
+def event_version(meeting: Dict) -> str:
+    """Identify the current version of an event, so edits trigger a new summary"""
+    if meeting.get('updated'):
+        return meeting['updated']
+    fields = {key: meeting.get(key) for key in ('summary', 'description', 'start', 'end')}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class MeetingDaemon:
+    """Generates each meeting's summary a lead time before it starts"""
+
+    def __init__(self, list_meetings: Callable[[], List[Dict]], process: Callable[[Dict], Dict],
+                 on_result: Optional[Callable[[Dict, Dict], None]] = None, workers: Optional[int] = None):
+        self.list_meetings = list_meetings
+        self.process = process
+        self.on_result = on_result
+        self.lead_time = timedelta(minutes=float(os.getenv('DAEMON_LEAD_MINUTES', 15)))
+        self.refresh_interval = float(os.getenv('DAEMON_REFRESH_SECONDS', 60))
+        # Failed runs are retried with exponential backoff until the meeting starts
+        self.retry_delay = float(os.getenv('DAEMON_RETRY_SECONDS', 30))
+        self.max_retry_delay = float(os.getenv('DAEMON_RETRY_MAX_SECONDS', 300))
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or int(os.getenv('MEETING_WORKERS', 1)),
+            thread_name_prefix='daemon'
+        )
+
+        # Heap of (due, start, sequence, event id); entries whose sequence no
+        # longer matches self.scheduled are stale and skipped when popped
+        self.queue = []
+        self.scheduled: Dict[str, Dict] = {}
+        # Event id -> version of the summary generated or being generated
+        self.done: Dict[str, str] = {}
+        self.in_progress: Dict[str, str] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._refresh_requested = True
+
+    def _schedule(self, meeting: Dict, start: datetime, version: str, due: Optional[datetime] = None,
+                  attempts: int = 0):
+        due = due or start - self.lead_time
+        sequence = next(self._sequence)
+        self.scheduled[meeting['id']] = {'meeting': meeting, 'start': start, 'version': version,
+                                         'sequence': sequence, 'attempts': attempts}
+        heapq.heappush(self.queue, (due, start, sequence, meeting['id']))
+
+    def refresh(self):
+        """Bring the queue in line with the calendar: add new and changed meetings, drop removed ones"""
+        meetings = self.list_meetings()
+        now = datetime.now(timezone.utc)
+        seen = set()
+        with self._lock:
+            for meeting in meetings:
+                start = parse_event_time(meeting.get('start', ''))
+                if not meeting.get('id') or start is None or start <= now:
+                    continue
+                seen.add(meeting['id'])
+                version = event_version(meeting)
+                entry = self.scheduled.get(meeting['id'])
+                if version in (self.done.get(meeting['id']), self.in_progress.get(meeting['id'])) or \
+                        (entry and entry['version'] == version):
+                    continue
+                if entry or meeting['id'] in self.done:
+                    print(f"Meeting changed, rescheduling: {meeting.get('summary', 'No subject')}")
+                self._schedule(meeting, start, version)
+
+            # Cancelled, started or moved out of range; their heap entries become stale
+            for event_id in list(self.scheduled):
+                if event_id not in seen:
+                    del self.scheduled[event_id]
+            for event_id in list(self.done):
+                if event_id not in seen:
+                    del self.done[event_id]
+        print(f"Daemon queue depth: {self.queue_depth()} scheduled, {len(self.in_progress)} running")
+
+    def request_refresh(self):
+        """Ask the loop to re-read the calendar now instead of at the next interval"""
+        self._refresh_requested = True
+        self._wake.set()
+
+    def queue_depth(self) -> int:
+        """Number of meetings waiting for their summary to be generated"""
+        return len(self.scheduled)
+
+    def status(self) -> Dict:
+        with self._lock:
+            live = [entry for entry in self.queue if self._is_live(entry)]
+            next_due = min(live)[0].isoformat() if live else None
+            return {
+                'queue_depth': len(self.scheduled),
+                'running': len(self.in_progress),
+                'completed': len(self.done),
+                'next_due': next_due
+            }
+
+    def _is_live(self, entry) -> bool:
+        _, _, sequence, event_id = entry
+        scheduled = self.scheduled.get(event_id)
+        return scheduled is not None and scheduled['sequence'] == sequence
+
+    def _pop_due(self, now: datetime) -> List[Dict]:
+        """Remove and return the scheduled entries that are due, earliest meeting first"""
+        due = []
+        with self._lock:
+            while self.queue and (self.queue[0][0] <= now or not self._is_live(self.queue[0])):
+                entry = heapq.heappop(self.queue)
+                if self._is_live(entry):
+                    scheduled = self.scheduled.pop(entry[3])
+                    self.in_progress[entry[3]] = scheduled['version']
+                    due.append(scheduled)
+        return due
+
+    def _run(self, entry: Dict):
+        meeting = entry['meeting']
+        try:
+            result = self.process(meeting)
+        except Exception as e:
+            print(f"Error processing meeting {meeting.get('summary', 'No subject')}: {e}")
+            self._retry(entry)
+            return
+
+        with self._lock:
+            # The event changed while this ran; the newer version's run owns the result
+            if self.in_progress.get(meeting['id']) != entry['version']:
+                return
+            try:
+                if self.on_result:
+                    self.on_result(meeting, result)
+            except Exception as e:
+                print(f"Error saving summary for {meeting.get('summary', 'No subject')}: {e}")
+            del self.in_progress[meeting['id']]
+            self.done[meeting['id']] = entry['version']
+
+    def _retry(self, entry: Dict):
+        """Schedule a failed run again after an exponential backoff, if that is before the meeting starts"""
+        meeting = entry['meeting']
+        attempts = entry['attempts'] + 1
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** (attempts - 1))
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        with self._lock:
+            if self.in_progress.get(meeting['id']) != entry['version']:
+                return
+            del self.in_progress[meeting['id']]
+            if meeting['id'] in self.scheduled:
+                # A newer version of the event is already queued
+                return
+            if retry_at >= entry['start']:
+                print(f"Giving up on {meeting.get('summary', 'No subject')} after {attempts} attempts")
+                self.done[meeting['id']] = entry['version']
+                return
+            print(f"Retrying {meeting.get('summary', 'No subject')} in {delay:.0f}s")
+            self._schedule(meeting, entry['start'], entry['version'], due=retry_at, attempts=attempts)
+        self._wake.set()
+
+    def _seconds_until_next(self, now: datetime, next_refresh: datetime) -> float:
+        with self._lock:
+            wake_at = next_refresh
+            if self.queue:
+                wake_at = min(wake_at, self.queue[0][0])
+        return max(0.0, (wake_at - now).total_seconds())
+
+    def run_forever(self):
+        """Refresh the calendar periodically and generate summaries as they fall due, until stop()"""
+        next_refresh = datetime.now(timezone.utc)
+        while not self._stopped.is_set():
+            now = datetime.now(timezone.utc)
+            if self._refresh_requested or now >= next_refresh:
+                self._refresh_requested = False
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Error refreshing meetings: {e}")
+                next_refresh = now + timedelta(seconds=self.refresh_interval)
+
+            for entry in self._pop_due(now):
+                self.executor.submit(self._run, entry)
+
+            self._wake.wait(self._seconds_until_next(datetime.now(timezone.utc), next_refresh))
+            self._wake.clear()
+        self.executor.shutdown(wait=True)
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def serve_status(self, port: int) -> ThreadingHTTPServer:
+        """Serve status() as JSON on localhost:port (e.g. GET /status) from a background thread"""
+        daemon = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(daemon.status()).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('localhost', port), StatusHandler)
+        threading.Thread(target=server.serve_forever, name='daemon-status', daemon=True).start()
+        return server
@@ -21,8 +21,9 @@
 Main service class that orchestrates meeting automation tasks.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from src.config.config import Config
 
 class MeetingService:
@@ -62,6 +63,46 @@ class MeetingService:
         except Exception as e:
             return {"error": str(e)}
     
+    def process_meetings(self, meeting_ids: List[str], workers: int = 1, batch: bool = False) -> List[Dict]:
+        """
+        Process several meetings, up to `workers` at a time.
+        
+        Results are returned in the same order as meeting_ids. process_meeting
+        already turns failures into error entries, so one bad meeting does not
+        affect the others. With batch=True all summaries are generated by one
+        provider batch job instead of a call per meeting.
+        """
+        if batch:
+            return self._process_meetings_batch(meeting_ids)
+            
+        if workers <= 1:
+            return [self.process_meeting(meeting_id) for meeting_id in meeting_ids]
+            
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='meeting') as executor:
+            return list(executor.map(self.process_meeting, meeting_ids))
+    
+    def _process_meetings_batch(self, meeting_ids: List[str]) -> List[Dict]:
+        """Gather each meeting's context, then summarise them all in one batch job"""
+        results = []
+        pending = []
+        for meeting_id in meeting_ids:
+            try:
+                meeting = self.calendar_service.get_meeting_details(meeting_id)
+                if not meeting:
+                    results.append({"error": "Meeting not found"})
+                    continue
+                context = self.collaboration_service.get_meeting_context(meeting)
+                results.append({"meeting": meeting, "context": context})
+                pending.append(len(results) - 1)
+            except Exception as e:
+                results.append({"error": str(e)})
+        
+        summaries = self.summary_service.generate_summaries_batch(
+            [(results[i]["meeting"], results[i]["context"]) for i in pending])
+        for i, summary in zip(pending, summaries):
+            results[i]["summary"] = summary
+        return results
+    
     def get_upcoming_meetings(self) -> List[Dict]:
         """Get all upcoming meetings within the next 24 hours"""
         now = datetime.now()
@@ -76,6 +117,15 @@ class MeetingService:
             
         return self.summary_service.generate_summary(meeting)
     
+    def stream_meeting_summary(self, meeting_id: str) -> Iterator[str]:
+        """Generate summary for a specific meeting, yielding text as it is generated"""
+        meeting = self.calendar_service.get_meeting_details(meeting_id)
+        if not meeting:
+            yield "Meeting not found"
+            return
+            
+        yield from self.summary_service.stream_summary(meeting)
+    
     def search_meeting_context(self, meeting_id: str) -> Dict:
         """Search for context related to a meeting"""
         meeting = self.calendar_service.get_meeting_details(meeting_id)
@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Lazy pagination helpers for the Google, Microsoft Graph and Slack APIs.
+Each helper yields one page or item at a time so callers can stop early.
+"""
+
+from typing import Callable, Dict, Iterator, Optional
+import requests
+
+
+def iter_google_pages(list_method: Callable, **params) -> Iterator[Dict]:
+    """Yield result pages from a Google API list method, following nextPageToken"""
+    page_token = None
+    while True:
+        if page_token:
+            params['pageToken'] = page_token
+        result = list_method(**params).execute()
+        yield result
+
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            return
+
+
+def iter_google_items(list_method: Callable, items_key: str, **params) -> Iterator[Dict]:
+    """Yield items from every page of a Google API list method"""
+    for page in iter_google_pages(list_method, **params):
+        yield from page.get(items_key, [])
+
+
+def iter_graph_pages(url: str, headers: Dict, params: Optional[Dict] = None,
+                     session=requests) -> Iterator[Dict]:
+    """Yield result pages from a Microsoft Graph collection, following @odata.nextLink"""
+    while url:
+        response = session.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        result = response.json()
+        yield result
+
+        # nextLink already carries the original query parameters
+        url = result.get('@odata.nextLink')
+        params = None
+
+
+def iter_graph_items(url: str, headers: Dict, params: Optional[Dict] = None,
+                     session=requests) -> Iterator[Dict]:
+    """Yield items from every page of a Microsoft Graph collection"""
+    for page in iter_graph_pages(url, headers, params, session):
+        yield from page.get('value', [])
+
+
+def iter_slack_items(method: Callable, items_key: str, **kwargs) -> Iterator[Dict]:
+    """Yield items from a Slack Web API method, following response cursors"""
+    cursor = None
+    while True:
+        if cursor:
+            kwargs['cursor'] = cursor
+        response = method(**kwargs)
+        yield from response.data.get(items_key, [])
+
+        cursor = response.data.get('response_metadata', {}).get('next_cursor')
+        if not cursor:
+            return
@@ -0,0 +1,333 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Push-based change ingestion.
+Registers Google Calendar events.watch channels and Microsoft Graph
+change-notification subscriptions against a local HTTP receiver, listens
+for Slack Events over Socket Mode, and publishes every change to the
+event bus. Channels and subscriptions are renewed before they expire.
+
+Google and Graph deliver notifications to PUSH_PUBLIC_URL, which must be
+an HTTPS URL that forwards to the receiver (a reverse proxy or tunnel).
+"""
+
+import hmac
+import json
+import uuid
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+import requests
+from src.services.event_bus import CALENDAR_CHANGED, GRAPH_CHANGED, SLACK_MESSAGE, EventBus
+
+GRAPH_SUBSCRIPTIONS_URL = 'https://graph.microsoft.com/v1.0/subscriptions'
+# Graph accepts at most 4230 minutes for Outlook resources
+GRAPH_MAX_TTL = timedelta(minutes=4200)
+GOOGLE_PATH = '/google/calendar'
+GRAPH_PATH = '/microsoft/notifications'
+# Slack channel_type of public and private channels, the conversations the Slack index crawls;
+# direct and group messages (im, mpim) are never indexed
+SLACK_CHANNEL_TYPES = ('channel', 'group')
+
+
+class WebhookReceiver:
+    """Local HTTP endpoint for Google Calendar and Microsoft Graph notifications"""
+
+    def __init__(self, bus: EventBus, secret: str, host: str = '0.0.0.0', port: int = 8090):
+        self.bus = bus
+        self.secret = secret
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    def _handler(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: str = '', content_type: str = 'text/plain'):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if url.path == GOOGLE_PATH:
+                    return self._reply(receiver.handle_google(self.headers))
+                if url.path == GRAPH_PATH:
+                    # Graph validates a new subscription by expecting its token echoed back
+                    token = parse_qs(url.query).get('validationToken')
+                    if token:
+                        return self._reply(200, token[0])
+                    return self._reply(receiver.handle_graph(body))
+                self._reply(404)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _valid(self, token: Optional[str]) -> bool:
+        return bool(token) and hmac.compare_digest(token, self.secret)
+
+    def handle_google(self, headers) -> int:
+        """Publish a calendar change for a valid Google push notification"""
+        if not self._valid(headers.get('X-Goog-Channel-Token')):
+            return 403
+        # 'sync' only confirms that a new channel works
+        if headers.get('X-Goog-Resource-State') != 'sync':
+            self.bus.publish(CALENDAR_CHANGED, {
+                'source': 'google',
+                'channel_id': headers.get('X-Goog-Channel-ID'),
+                'state': headers.get('X-Goog-Resource-State')
+            })
+        return 200
+
+    def handle_graph(self, body: bytes) -> int:
+        """Publish each valid Graph change notification"""
+        try:
+            notifications = json.loads(body or b'{}').get('value', [])
+        except ValueError:
+            return 400
+        for notification in notifications:
+            if not self._valid(notification.get('clientState')):
+                continue
+            resource = notification.get('resource', '')
+            topic = CALENDAR_CHANGED if 'event' in resource.lower() else GRAPH_CHANGED
+            self.bus.publish(topic, {
+                'source': 'microsoft',
+                'resource': resource,
+                'change_type': notification.get('changeType')
+            })
+        return 202
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='webhooks', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+
+
+class GoogleCalendarWatch:
+    """A Google Calendar events.watch channel, replaced before it expires"""
+
+    def __init__(self, service, address: str, secret: str, ttl: timedelta, calendar_id: str = 'primary'):
+        self.service = service
+        self.address = address
+        self.secret = secret
+        self.ttl = ttl
+        self.calendar_id = calendar_id
+        self.channel: Optional[Dict] = None
+
+    def start(self):
+        channel = self.service.events().watch(calendarId=self.calendar_id, body={
+            'id': str(uuid.uuid4()),
+            'type': 'web_hook',
+            'address': self.address,
+            'token': self.secret,
+            'params': {'ttl': str(int(self.ttl.total_seconds()))}
+        }).execute()
+        previous, self.channel = self.channel, channel
+        # Overlap with the old channel so no change falls between the two
+        if previous:
+            self._stop_channel(previous)
+        print(f"Watching Google Calendar {self.calendar_id} (channel {channel['id']})")
+
+    def expires_at(self) -> Optional[datetime]:
+        if not self.channel or not self.channel.get('expiration'):
+            return None
+        return datetime.fromtimestamp(int(self.channel['expiration']) / 1000, tz=timezone.utc)
+
+    def _stop_channel(self, channel: Dict):
+        try:
+            self.service.channels().stop(body={'id': channel['id'], 'resourceId': channel['resourceId']}).execute()
+        except Exception as e:
+            print(f"Error stopping Google channel {channel['id']}: {e}")
+
+    def stop(self):
+        if self.channel:
+            self._stop_channel(self.channel)
+            self.channel = None
+
+
+class GraphSubscriptions:
+    """Microsoft Graph change-notification subscriptions, renewed before they expire"""
+
+    def __init__(self, headers: Dict, notification_url: str, secret: str, ttl: timedelta,
+                 resources: List[str], session: Optional[requests.Session] = None):
+        self.headers = headers
+        self.notification_url = notification_url
+        self.secret = secret
+        self.ttl = min(ttl, GRAPH_MAX_TTL)
+        self.resources = resources
+        self.session = session or requests.Session()
+        self.subscriptions: Dict[str, Dict] = {}
+
+    def _expiration(self) -> str:
+        return (datetime.now(timezone.utc) + self.ttl).strftime('%Y-%m-%dT%H:%M:%S.0000000Z')
+
+    def _subscribe(self, resource: str):
+        response = self.session.post(GRAPH_SUBSCRIPTIONS_URL, headers=self.headers, json={
+            'changeType': 'created,updated,deleted',
+            'notificationUrl': self.notification_url,
+            'resource': resource,
+            'expirationDateTime': self._expiration(),
+            'clientState': self.secret
+        })
+        response.raise_for_status()
+        self.subscriptions[resource] = response.json()
+        print(f"Subscribed to Graph changes for {resource}")
+
+    def start(self):
+        for resource in self.resources:
+            self._subscribe(resource)
+
+    def renew(self):
+        """Extend every subscription, recreating any that Graph has removed"""
+        for resource in self.resources:
+            subscription = self.subscriptions.get(resource)
+            if subscription:
+                response = self.session.patch(
+                    f"{GRAPH_SUBSCRIPTIONS_URL}/{subscription['id']}",
+                    headers=self.headers,
+                    json={'expirationDateTime': self._expiration()}
+                )
+                if response.status_code != 404:
+                    response.raise_for_status()
+                    self.subscriptions[resource] = response.json()
+                    continue
+            # Graph drops subscriptions whose notifications keep failing
+            self._subscribe(resource)
+
+    def stop(self):
+        for subscription in self.subscriptions.values():
+            try:
+                self.session.delete(f"{GRAPH_SUBSCRIPTIONS_URL}/{subscription['id']}", headers=self.headers)
+            except requests.RequestException as e:
+                print(f"Error deleting Graph subscription {subscription['id']}: {e}")
+        self.subscriptions = {}
+
+
+class SlackSocketListener:
+    """Receives Slack Events over Socket Mode and publishes new messages"""
+
+    def __init__(self, bus: EventBus, app_token: str, web_client=None):
+        self.bus = bus
+        self.app_token = app_token
+        self.web_client = web_client
+        self.client = None
+
+    def _on_request(self, client, request):
+        from slack_sdk.socket_mode.response import SocketModeResponse
+
+        if request.type != 'events_api':
+            return
+        # Acknowledge first; Slack retries events that are not acknowledged within 3 seconds
+        client.send_socket_mode_response(SocketModeResponse(envelope_id=request.envelope_id))
+        event = request.payload.get('event', {})
+        # Edits, joins and other subtypes are picked up by the next index refresh
+        if (event.get('type') == 'message' and not event.get('subtype')
+                and event.get('channel_type') in SLACK_CHANNEL_TYPES):
+            self.bus.publish(SLACK_MESSAGE, {'channel': event['channel'], 'message': event})
+
+    def start(self):
+        from slack_sdk.socket_mode import SocketModeClient
+
+        self.client = SocketModeClient(app_token=self.app_token, web_client=self.web_client)
+        self.client.socket_mode_request_listeners.append(self._on_request)
+        self.client.connect()
+        print("Listening for Slack events over Socket Mode")
+
+    def stop(self):
+        if self.client:
+            self.client.close()
+
+
+class PushIngestion:
+    """Starts the receiver and every configured push source, and keeps them renewed"""
+
+    def __init__(self, bus: EventBus, config: Dict):
+        self.bus = bus
+        self.config = config
+        self.receiver: Optional[WebhookReceiver] = None
+        self.sources = []
+        self._stopped = threading.Event()
+
+    def start(self, google_service=None, ms_headers: Optional[Dict] = None, slack_app_token: Optional[str] = None,
+              slack_client=None):
+        """Start whichever sources have credentials; returns the names of those started"""
+        config = self.config
+        ttl = timedelta(seconds=config['channel_ttl'])
+        public_url = config['public_url'].rstrip('/') if config.get('public_url') else None
+
+        if public_url and (google_service or ms_headers):
+            self.receiver = WebhookReceiver(self.bus, config['secret'], config['host'], config['port'])
+            self.receiver.start()
+            print(f"Webhook receiver listening on {config['host']}:{config['port']}")
+            if google_service:
+                self.sources.append(GoogleCalendarWatch(google_service, public_url + GOOGLE_PATH,
+                                                        config['secret'], ttl))
+            if ms_headers:
+                self.sources.append(GraphSubscriptions(ms_headers, public_url + GRAPH_PATH, config['secret'],
+                                                       ttl, config['graph_resources']))
+        elif google_service or ms_headers:
+            print("PUSH_PUBLIC_URL is not set; calendars stay poll-based")
+
+        if slack_app_token:
+            self.sources.append(SlackSocketListener(self.bus, slack_app_token, slack_client))
+
+        started = []
+        for source in self.sources:
+            try:
+                source.start()
+                started.append(type(source).__name__)
+            except Exception as e:
+                print(f"Error starting {type(source).__name__}: {e}")
+
+        threading.Thread(target=self._renew_loop, name='push-renew', daemon=True).start()
+        return started
+
+    def _renew_loop(self):
+        """Renew channels and subscriptions well before they expire"""
+        interval = min(self.config['channel_ttl'], GRAPH_MAX_TTL.total_seconds()) / 2
+        while not self._stopped.wait(interval):
+            for source in self.sources:
+                try:
+                    if isinstance(source, GoogleCalendarWatch):
+                        source.start()
+                    elif isinstance(source, GraphSubscriptions):
+                        source.renew()
+                except Exception as e:
+                    print(f"Error renewing {type(source).__name__}: {e}")
+
+    def stop(self):
+        self._stopped.set()
+        for source in self.sources:
+            try:
+                source.stop()
+            except Exception as e:
+                print(f"Error stopping {type(source).__name__}: {e}")
+        if self.receiver:
+            self.receiver.stop()
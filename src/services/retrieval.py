@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Tokenised relevance ranking for context retrieval.
+Scores messages, emails and file names against the meeting with a
+vectorised Okapi BM25 implementation.
+"""
+
+import os
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'with', 'no'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, dropping stop words"""
+    return [term for term in re.findall(r'[a-z0-9]+', text.lower()) if term not in STOP_WORDS]
+
+
+class BM25Ranker:
+    """Okapi BM25 scorer over a batch of documents"""
+
+    def __init__(self, k1: Optional[float] = None, b: Optional[float] = None):
+        self.k1 = k1 if k1 is not None else float(os.getenv('BM25_K1', 1.5))
+        self.b = b if b is not None else float(os.getenv('BM25_B', 0.75))
+
+    def score(self, query: str, documents: Sequence[str], doc_freqs: Optional[Dict[str, int]] = None,
+              n_docs: Optional[int] = None, avg_doc_len: Optional[float] = None) -> np.ndarray:
+        """
+        Score every document against the query.
+        
+        Corpus statistics default to those of the given documents. A caller
+        that only scores a candidate subset of a larger corpus, such as the
+        Slack index, should pass the corpus-wide document frequencies, size
+        and average length so IDF is not skewed.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms or not documents:
+            return np.zeros(len(documents))
+
+        term_index = {term: column for column, term in enumerate(terms)}
+        tf = np.zeros((len(documents), len(terms)), dtype=np.float32)
+        doc_len = np.zeros(len(documents), dtype=np.float32)
+        for row, document in enumerate(documents):
+            tokens = tokenize(document)
+            doc_len[row] = len(tokens)
+            for term, count in Counter(tokens).items():
+                column = term_index.get(term)
+                if column is not None:
+                    tf[row, column] = count
+
+        if doc_freqs is None:
+            df = (tf > 0).sum(axis=0)
+        else:
+            df = np.array([doc_freqs.get(term, 0) for term in terms], dtype=np.float32)
+        n_docs = n_docs or len(documents)
+        avg_doc_len = avg_doc_len or max(float(doc_len.mean()), 1.0)
+
+        idf = np.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+        norm = self.k1 * (1 - self.b + self.b * doc_len / avg_doc_len)
+        return (tf * (self.k1 + 1) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+    def top_k(self, query: str, documents: Sequence[str], k: int, **corpus_stats) -> List[Tuple[int, float]]:
+        """Return (document index, score) for the k best documents with a positive score"""
+        scores = self.score(query, documents, **corpus_stats)
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(i), float(scores[i])) for i in ranked if scores[i] > 0]
+
+
+def rank_items(query: str, items: List[Dict], k: int, text: Callable[[Dict], str],
+               ranker: Optional[BM25Ranker] = None) -> List[Dict]:
+    """Return copies of the k most relevant items, best first, with their BM25 score"""
+    ranker = ranker or BM25Ranker()
+    documents = [text(item) for item in items]
+    return [{**items[i], 'score': score} for i, score in ranker.top_k(query, documents, k)]
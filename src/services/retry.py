@@ -0,0 +1,268 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Retry engine for calls to AI providers and other HTTP APIs.
+Retry policy is configured separately from the call arguments. Waits use
+decorrelated jitter so parallel workers do not retry in lockstep, a
+provider's Retry-After header takes precedence over the computed delay,
+and a circuit breaker per endpoint stops calling an endpoint that keeps
+failing until it has had time to recover.
+"""
+
+import os
+import time
+import random
+import socket
+import asyncio
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+# Parts of exception class names that mark a connection failure or timeout
+NETWORK_ERROR_MARKERS = ('Timeout', 'Connection', 'Transport', 'Disconnected')
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+
+class RetryPolicy:
+    """How many attempts to make and how long to wait between them"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls, max_attempts: Optional[int] = None) -> 'RetryPolicy':
+        """Build a policy from RETRY_* settings, optionally overriding the attempt count"""
+        return cls(
+            max_attempts=max_attempts or int(os.getenv('RETRY_MAX_ATTEMPTS', 3)),
+            base_delay=float(os.getenv('RETRY_BASE_DELAY', 1.0)),
+            max_delay=float(os.getenv('RETRY_MAX_DELAY', 30.0))
+        )
+
+    def next_delay(self, previous: float) -> float:
+        """Decorrelated jitter: a random delay between the base and three times the last one"""
+        return min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one trial call through after reset_timeout"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Whether a call may go through now"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+def _response_of(error: Exception):
+    """The HTTP response attached to an SDK or requests exception, if any"""
+    # A requests.Response for a 4xx/5xx status is falsy, so test for None explicitly
+    response = getattr(error, 'response', None)
+    if response is None:
+        response = getattr(error, 'resp', None)
+    return response
+
+
+def is_network_error(error: Exception) -> bool:
+    """Whether the call failed before any response arrived: connection errors and timeouts"""
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError, socket.timeout)):
+        return True
+    # SDK exceptions (APIConnectionError, APITimeoutError, ReadTimeout, EndpointConnectionError, ...)
+    # are matched by name so their packages need not be imported here
+    return any(marker in cls.__name__ for cls in type(error).__mro__ for marker in NETWORK_ERROR_MARKERS)
+
+
+def status_code(error: Exception) -> Optional[int]:
+    """HTTP status of a failed call, across the SDKs we use"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        # Cohere errors
+        status = getattr(error, 'http_status', None)
+    if status is None and isinstance(getattr(error, 'code', None), int):
+        # google.api_core errors; other exceptions use .code for non-HTTP values
+        status = error.code
+    if status is None:
+        response = _response_of(error)
+        if isinstance(response, dict):
+            # botocore ClientError
+            status = response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+        elif response is not None:
+            status = getattr(response, 'status_code', None)
+            if status is None:
+                status = getattr(response, 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the provider asked us to wait, from a Retry-After header"""
+    response = _response_of(error)
+    if isinstance(response, dict):
+        headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+    else:
+        headers = getattr(response, 'headers', None)
+        if headers is None and hasattr(response, 'get'):
+            # httplib2 responses are dicts of lower-cased headers
+            headers = response
+    if not headers:
+        return None
+
+    # Header names are case-insensitive, and Slack and httplib2 send them in lower case
+    value = next((value for name, value in headers.items() if name.lower() == 'retry-after'), None)
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Throttling, server errors, connection errors and timeouts are retried"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = status_code(error)
+    if status is None:
+        return is_network_error(error)
+    return status in RETRYABLE_STATUS
+
+
+class RetryEngine:
+    """Runs calls under a retry policy with one circuit breaker per endpoint"""
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, failure_threshold: Optional[int] = None,
+                 reset_timeout: Optional[float] = None):
+        self.policy = policy or RetryPolicy.from_env()
+        self.failure_threshold = failure_threshold or int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+        self.reset_timeout = reset_timeout or float(os.getenv('CIRCUIT_RESET_TIMEOUT', 60))
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[endpoint]
+
+    @staticmethod
+    def _wait(endpoint: str, attempt: int, delay: float, error: Exception, max_delay: float) -> float:
+        """Seconds to wait before the next attempt: Retry-After if given, else the jittered delay
+
+        Retry-After is capped at the policy's max_delay so a bad header cannot stall a worker.
+        """
+        wait = retry_after(error)
+        wait = delay if wait is None else min(wait, max_delay)
+        print(f"{endpoint} attempt {attempt} failed: {error}; retrying in {wait:.1f}s")
+        return wait
+
+    def call(self, endpoint: str, func: Callable, args: tuple = (), kwargs: Optional[Dict] = None,
+             policy: Optional[RetryPolicy] = None) -> Any:
+        """Call func(*args, **kwargs), retrying per the policy with blocking sleeps"""
+        policy = policy or self.policy
+        breaker = self.breaker(endpoint)
+        delay = policy.base_delay
+        for attempt in range(1, policy.max_attempts + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {endpoint}")
+            try:
+                result = func(*args, **(kwargs or {}))
+            except Exception as e:
+                # Client errors say nothing about the endpoint's health
+                if not is_retryable(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt == policy.max_attempts:
+                    raise
+                delay = policy.next_delay(delay)
+                time.sleep(self._wait(endpoint, attempt, delay, e, policy.max_delay))
+                continue
+            breaker.record_success()
+            return result
+
+    async def acall(self, endpoint: str, func: Callable, args: tuple = (), kwargs: Optional[Dict] = None,
+                    policy: Optional[RetryPolicy] = None) -> Any:
+        """Await func(*args, **kwargs), retrying per the policy without blocking the event loop"""
+        policy = policy or self.policy
+        breaker = self.breaker(endpoint)
+        delay = policy.base_delay
+        for attempt in range(1, policy.max_attempts + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {endpoint}")
+            try:
+                result = await func(*args, **(kwargs or {}))
+            except Exception as e:
+                if not is_retryable(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt == policy.max_attempts:
+                    raise
+                delay = policy.next_delay(delay)
+                await asyncio.sleep(self._wait(endpoint, attempt, delay, e, policy.max_delay))
+                continue
+            breaker.record_success()
+            return result
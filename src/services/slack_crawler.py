@@ -0,0 +1,189 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Rate-limit-aware concurrent crawler for Slack channel history.
+Each Web API method gets its own token bucket sized to Slack's rate tier,
+429 responses pause the bucket for Retry-After seconds and the page is
+retried from the same cursor.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from slack_sdk.errors import SlackApiError
+from src.services.retry import retry_after
+
+# Requests per minute for the Slack rate tier of each method we call
+SLACK_METHOD_RATES = {
+    'conversations.list': int(os.getenv('SLACK_LIST_RATE_PER_MINUTE', 20)),        # Tier 2
+    'conversations.history': int(os.getenv('SLACK_HISTORY_RATE_PER_MINUTE', 50))  # Tier 3
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket that can be paused after a 429"""
+
+    def __init__(self, rate_per_minute: int, capacity: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, rate_per_minute // 5)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for the given number of seconds"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = self._blocked_until
+
+
+class ChannelCrawl:
+    """Result of crawling one channel's history"""
+
+    def __init__(self, channel_id: str):
+        self.channel_id = channel_id
+        self.messages: List[Dict] = []
+        self.cursor: Optional[str] = None
+        self.complete = False
+
+
+class SlackCrawler:
+    """Fetches many channel histories concurrently within Slack rate limits"""
+
+    def __init__(self, client, max_workers: Optional[int] = None):
+        self.client = client
+        self.max_workers = max_workers or int(os.getenv('SLACK_CRAWL_WORKERS', 8))
+        self.max_retries = int(os.getenv('SLACK_MAX_RETRIES', 5))
+        self.buckets = {method: TokenBucket(rate) for method, rate in SLACK_METHOD_RATES.items()}
+        self._stats_lock = threading.Lock()
+        self.stats = {'calls': 0, 'messages': 0, 'rate_limited': 0, 'seconds': 0.0}
+
+    def _call(self, method: str, func, **kwargs):
+        """Call a Slack method through its bucket, waiting out 429 responses"""
+        for attempt in range(self.max_retries + 1):
+            self.buckets[method].acquire()
+            with self._stats_lock:
+                self.stats['calls'] += 1
+            try:
+                return func(**kwargs)
+            except SlackApiError as e:
+                if e.response.status_code != 429 or attempt == self.max_retries:
+                    raise
+                wait = retry_after(e)
+                with self._stats_lock:
+                    self.stats['rate_limited'] += 1
+                self.buckets[method].pause(1.0 if wait is None else wait)
+
+    def _iter_pages(self, method: str, func, items_key: str, cursor: Optional[str] = None,
+                    **kwargs) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+        """Yield (items, next_cursor) for each page, starting from cursor"""
+        while True:
+            if cursor:
+                kwargs['cursor'] = cursor
+            response = self._call(method, func, **kwargs)
+            cursor = response.data.get('response_metadata', {}).get('next_cursor') or None
+            yield response.data.get(items_key, []), cursor
+            if not cursor:
+                return
+
+    def list_channels(self) -> List[Dict]:
+        """List all public and private channels the bot can see"""
+        channels = []
+        pages = self._iter_pages(
+            'conversations.list',
+            self.client.conversations_list,
+            'channels',
+            types="public_channel,private_channel",
+            limit=200
+        )
+        for items, _ in pages:
+            channels.extend(items)
+        return channels
+
+    def crawl_channel(self, channel_id: str, oldest: str, cursor: Optional[str] = None) -> ChannelCrawl:
+        """
+        Fetch a channel's messages newer than oldest.
+        
+        If a page still fails after retries, the crawl stops and keeps the
+        cursor of the failed page so a later crawl can resume from it.
+        """
+        result = ChannelCrawl(channel_id)
+        result.cursor = cursor
+        pages = self._iter_pages(
+            'conversations.history',
+            self.client.conversations_history,
+            'messages',
+            cursor=cursor,
+            channel=channel_id,
+            oldest=oldest,
+            limit=200
+        )
+        try:
+            for items, next_cursor in pages:
+                result.messages.extend(items)
+                result.cursor = next_cursor
+            result.complete = True
+        except SlackApiError as e:
+            print(f"Error crawling Slack channel {channel_id}, will resume later: {e}")
+
+        with self._stats_lock:
+            self.stats['messages'] += len(result.messages)
+        return result
+
+    def crawl(self, channels: Dict[str, Tuple[str, Optional[str]]]) -> Dict[str, ChannelCrawl]:
+        """Crawl channels concurrently; maps channel_id to (oldest, resume cursor)"""
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='slack') as executor:
+            futures = {
+                channel_id: executor.submit(self.crawl_channel, channel_id, oldest, cursor)
+                for channel_id, (oldest, cursor) in channels.items()
+            }
+            results = {channel_id: future.result() for channel_id, future in futures.items()}
+
+        with self._stats_lock:
+            self.stats['seconds'] += time.monotonic() - started
+        return results
+
+    def throughput(self) -> Dict:
+        """Report calls, messages and messages per second so far"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['messages_per_second'] = stats['messages'] / stats['seconds'] if stats['seconds'] else 0.0
+        return stats
@@ -0,0 +1,207 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Persistent local index of Slack messages.
+Crawls each channel once, then only fetches messages newer than the
+channel's watermark and answers context queries from an inverted index.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+from src.services.slack_crawler import SlackCrawler
+from src.services.retrieval import BM25Ranker, tokenize
+
+
+class SlackIndex:
+    """Incrementally updated inverted index over Slack channel history"""
+
+    def __init__(self, index_file: Optional[str] = None):
+        self.index_file = index_file or os.getenv('SLACK_INDEX_FILE', 'slack_index.json')
+        self.history_days = int(os.getenv('SLACK_INDEX_HISTORY_DAYS', 30))
+        self.refresh_interval = int(os.getenv('SLACK_INDEX_REFRESH_SECONDS', 300))
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+
+        self.channels: Dict[str, Dict] = {}
+        self.messages: Dict[str, Dict] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.total_terms = 0
+        self.ranker = BM25Ranker()
+        self._load()
+
+    def _load(self):
+        """Load messages and channel watermarks, then rebuild the postings"""
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable Slack index: {e}")
+            return
+
+        self.channels = data.get('channels', {})
+        for key, message in data.get('messages', {}).items():
+            self._add(key, message)
+
+    def _save(self):
+        """Write messages and channel watermarks to disk"""
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'channels': self.channels, 'messages': self.messages}, f)
+        os.replace(tmp_file, self.index_file)
+
+    def _add(self, key: str, message: Dict):
+        """Add a message to the store and its terms to the postings"""
+        self.messages[key] = message
+        terms = tokenize(message['text'])
+        self.total_terms += len(terms)
+        for term in set(terms):
+            self.postings[term].add(key)
+
+    def _prune(self):
+        """Drop messages older than the retention window"""
+        cutoff = time.time() - self.history_days * 86400
+        for key, message in list(self.messages.items()):
+            if float(message['timestamp']) < cutoff:
+                del self.messages[key]
+                terms = tokenize(message['text'])
+                self.total_terms -= len(terms)
+                for term in set(terms):
+                    self.postings[term].discard(key)
+
+    def refresh(self, client, force: bool = False) -> int:
+        """
+        Fetch messages newer than each channel's watermark.
+        
+        Returns the number of new messages indexed. Calls within
+        SLACK_INDEX_REFRESH_SECONDS of the last refresh are skipped unless
+        force is set.
+        """
+        with self._lock:
+            if not force and time.time() - self._last_refresh < self.refresh_interval:
+                return 0
+
+            default_oldest = str(time.time() - self.history_days * 86400)
+            crawler = SlackCrawler(client)
+
+            to_crawl = {}
+            for channel in crawler.list_channels():
+                state = self.channels.setdefault(channel['id'], {'oldest': default_oldest})
+                state['name'] = channel['name']
+                to_crawl[channel['id']] = (state['oldest'], state.get('cursor'))
+
+            results = crawler.crawl(to_crawl)
+
+            added = 0
+            for channel_id, result in results.items():
+                added += self.add_messages(channel_id, result.messages, result.complete, result.cursor)
+
+            self._prune()
+            self._save()
+            self._last_refresh = time.time()
+
+            stats = crawler.throughput()
+            print(f"Indexed {added} Slack messages from {len(results)} channels in "
+                  f"{stats['seconds']:.1f}s ({stats['messages_per_second']:.1f} msg/s, "
+                  f"{stats['calls']} calls, {stats['rate_limited']} rate limited)")
+            return added
+
+    def add_messages(self, channel_id: str, messages, complete: bool = True,
+                     cursor: Optional[str] = None) -> int:
+        """
+        Index raw Slack messages for a channel.
+        
+        The channel watermark only moves once its history is complete. A
+        partial crawl keeps its resume cursor and the newest timestamp seen,
+        so the next refresh continues where this one stopped.
+        """
+        state = self.channels.setdefault(channel_id, {'oldest': '0'})
+        added = 0
+        newest = state.get('newest_seen', state['oldest'])
+
+        for message in messages:
+            key = f"{channel_id}:{message['ts']}"
+            if key not in self.messages:
+                self._add(key, {
+                    'source': 'slack',
+                    'channel': state.get('name', channel_id),
+                    'user': message.get('user', 'unknown'),
+                    'text': message.get('text', ''),
+                    'timestamp': message['ts'],
+                    'platform': 'slack'
+                })
+                added += 1
+            if float(message['ts']) > float(newest):
+                newest = message['ts']
+
+        if complete:
+            state['oldest'] = newest
+            state.pop('cursor', None)
+            state.pop('newest_seen', None)
+        else:
+            state['cursor'] = cursor
+            state['newest_seen'] = newest
+        return added
+
+    def push_message(self, channel_id: str, message: Dict) -> int:
+        """
+        Index a message delivered over Socket Mode.
+        
+        The watermark is left alone, so the next refresh still backfills
+        anything missed while the socket was disconnected.
+        """
+        with self._lock:
+            state = self.channels.setdefault(channel_id, {'oldest': str(time.time() - self.history_days * 86400)})
+            return self.add_messages(channel_id, [message], complete=False, cursor=state.get('cursor'))
+
+    def search(self, query: str, days: int = 1, limit: int = 200) -> List[Dict]:
+        """
+        Find the indexed messages most relevant to the query.
+        
+        Candidates are the messages from the last `days` days that share at
+        least one term with the query. They are ranked with BM25 using the
+        document frequencies of the whole index.
+        """
+        cutoff = time.time() - days * 86400
+
+        with self._lock:
+            terms = set(tokenize(query))
+            keys = set()
+            for term in terms:
+                keys |= self.postings.get(term, set())
+            candidates = [
+                self.messages[key] for key in keys
+                if float(self.messages[key]['timestamp']) >= cutoff
+            ]
+            corpus_stats = {
+                'doc_freqs': {term: len(self.postings.get(term, ())) for term in terms},
+                'n_docs': len(self.messages),
+                'avg_doc_len': self.total_terms / len(self.messages) if self.messages else None
+            }
+
+        # Newest first, so equal scores keep the most recent messages
+        candidates.sort(key=lambda message: float(message['timestamp']), reverse=True)
+        ranked = self.ranker.top_k(query, [message['text'] for message in candidates], limit, **corpus_stats)
+        return [{**candidates[i], 'score': score} for i, score in ranked]
@@ -0,0 +1,152 @@
+# Copyright (c) 2025 Sisodia Bhumca, Inc.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Content-addressed, on-disk cache for generated summaries.
+Entries are keyed by a hash of the normalised prompt, provider, model and
+generation parameters, expire after a TTL and are evicted least recently
+used first.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class SummaryCache:
+    """LRU cache of summaries stored as one JSON file per entry"""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        self.cache_dir = cache_dir or os.getenv('SUMMARY_CACHE_DIR', '.summary_cache')
+        self.ttl = ttl if ttl is not None else int(os.getenv('SUMMARY_CACHE_TTL', 7 * 86400))
+        self.max_entries = max_entries or int(os.getenv('SUMMARY_CACHE_MAX_ENTRIES', 1000))
+        self.index_file = os.path.join(self.cache_dir, 'index.json')
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    @staticmethod
+    def make_key(prompt: str, provider: str, model: str, params: Optional[Dict] = None) -> str:
+        """Hash the normalised prompt together with everything that affects the output"""
+        normalised = re.sub(r'\s+', ' ', prompt).strip()
+        payload = json.dumps({
+            'prompt': normalised,
+            'provider': provider,
+            'model': model,
+            'params': params or {}
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load_index(self) -> OrderedDict:
+        """Load entry timestamps, least recently used first"""
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r') as f:
+                    entries = json.load(f)
+                return OrderedDict(sorted(entries.items(), key=lambda item: item[1]['accessed']))
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable summary cache index: {e}")
+        return OrderedDict()
+
+    def _save_index(self):
+        """Write entry timestamps to disk"""
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_file, self.index_file)
+
+    def _entry_path(self, key: str) -> str:
+        """Get the file holding a cache entry"""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remove(self, key: str):
+        """Drop an entry from the index and disk"""
+        self._index.pop(key, None)
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for a key, or None if missing or expired"""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry and time.time() - entry['created'] > self.ttl:
+                self._remove(key)
+                self.expired += 1
+                self._save_index()
+                entry = None
+
+            if not entry:
+                self.misses += 1
+                return None
+
+            try:
+                with open(self._entry_path(key), 'r') as f:
+                    summary = json.load(f)['summary']
+            except (OSError, ValueError, KeyError):
+                self._remove(key)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            entry['accessed'] = time.time()
+            self._index.move_to_end(key)
+            self._save_index()
+            self.hits += 1
+            return summary
+
+    def set(self, key: str, summary: str):
+        """Store a summary, evicting the least recently used entries if full"""
+        with self._lock:
+            now = time.time()
+            with open(self._entry_path(key), 'w') as f:
+                json.dump({'summary': summary}, f)
+            self._index[key] = {'created': now, 'accessed': now}
+            self._index.move_to_end(key)
+
+            while len(self._index) > self.max_entries:
+                oldest_key = next(iter(self._index))
+                self._remove(oldest_key)
+                self.evictions += 1
+            self._save_index()
+
+    def stats(self) -> Dict:
+        """Report hits, misses, expired and evicted entries, and the number of cached entries"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'entries': len(self._index)
+            }
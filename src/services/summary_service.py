@@ -21,16 +21,31 @@
 Service for generating meeting summaries using AI models.
 """
 
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from src.config.config import Config
-from src.models.ai_models import AIModelFactory
+from src.models.ai_models import AIModelFactory, HedgedModel, Prompt, output_schema
+from src.services.summary_cache import SummaryCache
+from src.services.batch_jobs import BatchRunner, make_custom_id
+from src.services.dedupe import MinHashDeduplicator
+from src.services.context_packer import (ContextPacker, get_token_counter, item_text, item_time, render_context,
+                                         render_item)
+
+# Fixed instructions for map-step chunk prompts, kept first so they form a cacheable prefix
+CHUNK_INSTRUCTIONS = "Summarise the context below briefly, keeping facts, decisions, action items and owners."
 
 class SummaryService:
     """Service for generating meeting summaries"""
     
     def __init__(self):
         self.config = Config()
-        self.ai_model = AIModelFactory.get_model(self.config.ai_model)
+        if self.config.model_warmup:
+            AIModelFactory.warmup([self.config.ai_model] + self.config.fallback_models)
+        self.ai_model = AIModelFactory.get_failover_model(self.config.ai_model, self.config.fallback_models)
+        self.summary_cache = SummaryCache() if self.config.summary_cache_enabled else None
+        self.count_tokens = get_token_counter(self.config.ai_model, self.config.model_config.get('model', ''))
+        self.context_packer = ContextPacker(self.count_tokens)
+        self.deduplicator = MinHashDeduplicator() if self.config.dedupe_enabled else None
         
     def generate_summary(self, meeting: Dict, context: Optional[Dict] = None) -> str:
         """
@@ -45,10 +60,10 @@ class SummaryService:
         """
         try:
             # Prepare the prompt
-            prompt = self._create_summary_prompt(meeting, context)
+            prompt, _ = self._build_prompt(meeting, context)
             
             # Generate summary using AI model
-            summary = self.ai_model.generate(prompt)
+            summary = self._generate_cached(prompt)
             
             # Format the summary based on preferences
             formatted_summary = self._format_summary(summary)
@@ -58,42 +73,284 @@ class SummaryService:
         except Exception as e:
             return f"Error generating summary: {str(e)}"
     
-    def _create_summary_prompt(self, meeting: Dict, context: Optional[Dict]) -> str:
-        """Create the prompt for AI model"""
+    def stream_summary(self, meeting: Dict, context: Optional[Dict] = None) -> Iterator[str]:
+        """
+        Generate a summary like generate_summary, yielding text as the model produces it.
+        
+        Args:
+            meeting: Meeting details dictionary
+            context: Optional context information (emails, messages, etc.)
+            
+        Yields:
+            Pieces of the formatted summary
+        """
+        try:
+            prompt, _ = self._build_prompt(meeting, context)
+            cached = self._cached(prompt)
+            if cached is not None:
+                yield self._format_summary(cached)
+                return
+            
+            prefix, suffix = self._format_parts()
+            remaining = self.config.max_summary_length - len(prefix)
+            chunks = []
+            answered = [self.config.ai_model]
+            if isinstance(self.ai_model, HedgedModel):
+                stream = self.ai_model.stream(prompt, on_provider=lambda name: answered.append(name))
+            else:
+                stream = self.ai_model.stream(prompt)
+            yield prefix
+            for chunk in stream:
+                chunks.append(chunk)
+                if remaining > 0:
+                    yield chunk[:remaining]
+                    remaining -= len(chunk)
+                    if remaining <= 0:
+                        yield "..."
+            yield suffix
+            
+            key = self._cache_key(prompt, answered[-1])
+            if key:
+                self.summary_cache.set(key, ''.join(chunks))
+                
+        except Exception as e:
+            yield f"Error generating summary: {str(e)}"
+    
+    def generate_summaries_batch(self, items: List[Tuple[Dict, Optional[Dict]]]) -> List[str]:
+        """
+        Generate summaries for several meetings as one provider batch job.
+        
+        Args:
+            items: (meeting, context) pairs, as passed to generate_summary
+            
+        Returns:
+            Formatted summary strings in the order of items
+        """
+        summaries = [None] * len(items)
+        prompts = {}
+        ids = {}
+        for index, (meeting, context) in enumerate(items):
+            try:
+                prompt, _ = self._build_prompt(meeting, context)
+            except Exception as e:
+                summaries[index] = f"Error generating summary: {str(e)}"
+                continue
+            cached = self._cached(prompt)
+            if cached is not None:
+                summaries[index] = self._format_summary(cached)
+                continue
+            custom_id = make_custom_id(meeting.get('id'), index)
+            prompts[custom_id] = prompt
+            ids[custom_id] = index
+        
+        try:
+            results = BatchRunner(self.config.ai_model, self.config.model_config).run(prompts)
+        except Exception as e:
+            results = {custom_id: e for custom_id in prompts}
+        
+        for custom_id, result in results.items():
+            if isinstance(result, Exception):
+                summaries[ids[custom_id]] = f"Error generating summary: {str(result)}"
+                continue
+            key = self._cache_key(prompts[custom_id])
+            if key:
+                self.summary_cache.set(key, result)
+            summaries[ids[custom_id]] = self._format_summary(result)
+        return summaries
+    
+    def prompt_cache_report(self) -> Dict:
+        """Input and cached prompt token counts reported by the provider so far"""
+        return self.ai_model.cache_report()
+    
+    def summary_cache_report(self) -> Dict:
+        """Summary cache hits, misses and evictions so far, or {} when caching is off"""
+        return self.summary_cache.stats() if self.summary_cache else {}
+    
+    def _cache_key(self, prompt: str, provider: Optional[str] = None) -> Optional[str]:
+        """Get the summary cache key for a prompt and provider, or None when caching is off"""
+        if not self.summary_cache:
+            return None
+        provider = provider or self.config.ai_model
+        params = {k: v for k, v in self.config.get_model_config(provider).items() if k != 'api_key'}
+        return SummaryCache.make_key(prompt, provider, params.get('model', ''), params)
+    
+    def _cached(self, prompt: str) -> Optional[str]:
+        """Get a cached summary for a prompt from the primary or any fallback provider"""
+        for provider in [self.config.ai_model] + self.config.fallback_models:
+            key = self._cache_key(prompt, provider)
+            summary = self.summary_cache.get(key) if key else None
+            if summary is not None:
+                return summary
+        return None
+    
+    def _generate_cached(self, prompt: str) -> str:
+        """Generate text for a prompt, reusing the cached result when available"""
+        summary = self._cached(prompt)
+        if summary is not None:
+            return summary
+        
+        # Cache under the provider that actually answered, which may be a fallback
+        if isinstance(self.ai_model, HedgedModel):
+            summary, provider = self.ai_model.generate_with_provider(prompt)
+        else:
+            summary, provider = self.ai_model.generate(prompt), self.config.ai_model
+        key = self._cache_key(prompt, provider)
+        if key:
+            self.summary_cache.set(key, summary)
+        return summary
+    
+    def _build_prompt(self, meeting: Dict, context: Optional[Dict]) -> Tuple[str, Optional[Dict]]:
+        """
+        Create the final prompt, summarising oversized context in chunks first.
+        
+        Returns the prompt and the context packing report, which is None
+        when there is no context or it was summarised in chunks.
+        """
+        if context and self.deduplicator:
+            # Collapse copies (cross-posts, forwarded mail) before counting or ranking anything
+            deduped, _ = self.deduplicator.dedupe_sources({
+                'emails': context.get('emails', []),
+                'messages': context.get('messages', [])
+            })
+            context = {**context, **deduped}
+        # Context the packer would have to cut is summarised in chunks instead
+        threshold = min(self.config.map_reduce_threshold, self.context_packer.budget)
+        if context and self._context_tokens(context) > threshold:
+            partial_summaries = self._summarize_chunks(meeting, self._context_lines(context))
+            return self._create_reduce_prompt(meeting, partial_summaries), None
+        return self._create_summary_prompt(meeting, context)
+    
+    def _context_lines(self, context: Dict) -> List[str]:
+        """Render every context item as one line, oldest first"""
+        items = [('Email', item) for item in context.get('emails', [])]
+        items += [('Message', item) for item in context.get('messages', [])]
+        # Oldest first, so new items land in the last chunks and earlier chunks stay cached
+        items.sort(key=lambda entry: item_time(entry[1]) or 0)
+        return [f"{label}: {item_text(item)}" for label, item in items]
+    
+    def _context_tokens(self, context: Dict) -> int:
+        """Count the tokens of all context items, as the context packer counts them"""
+        items = context.get('emails', []) + context.get('messages', [])
+        return sum(self.count_tokens(render_item(item)) for item in items)
+    
+    def _chunk_lines(self, lines: List[str]) -> List[str]:
+        """Group lines into chunks of at most summary_chunk_tokens tokens"""
+        chunks = []
+        current = []
+        current_tokens = 0
+        for line in lines:
+            tokens = self.count_tokens(line)
+            if current and current_tokens + tokens > self.config.summary_chunk_tokens:
+                chunks.append("\n".join(current))
+                current = []
+                current_tokens = 0
+            current.append(line)
+            current_tokens += tokens
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+    
+    def _summarize_chunks(self, meeting: Dict, lines: List[str]) -> List[str]:
+        """
+        Summarise context chunks concurrently, then merge the partial summaries
+        level by level until they fit in one chunk.
+        
+        Each chunk prompt goes through the summary cache, so chunks whose
+        content has not changed since the last run are not sent again.
+        """
+        title = meeting.get('title', 'No title')
+        summaries = None
+        while True:
+            chunks = self._chunk_lines(lines)
+            if summaries is not None and len(chunks) == len(summaries):
+                # The partial summaries are too long to merge any further
+                return summaries
+            prompts = [
+                Prompt(CHUNK_INSTRUCTIONS, f"Context related to the meeting '{title}':\n\n{chunk}")
+                for chunk in chunks
+            ]
+            with ThreadPoolExecutor(max_workers=self.config.map_workers) as executor:
+                summaries = list(executor.map(self._generate_cached, prompts))
+                
+            if len(summaries) == 1 or sum(map(self.count_tokens, summaries)) <= self.config.summary_chunk_tokens:
+                return summaries
+            lines = summaries
+    
+    def _create_reduce_prompt(self, meeting: Dict, partial_summaries: List[str]) -> str:
+        """Create the prompt that combines partial context summaries"""
+        prompt = f"Meeting Summary Request:\n\n"
+        prompt += f"Title: {meeting.get('title', 'No title')}\n"
+        prompt += f"Date: {meeting.get('date', 'Unknown')}\n"
+        prompt += f"Attendees: {', '.join(meeting.get('attendees', []))}\n\n"
+        
+        prompt += "Summaries of Related Context:\n"
+        for partial_summary in partial_summaries:
+            prompt += f"- {partial_summary}\n"
+        
+        return Prompt(self._prompt_prefix(), prompt)
+    
+    def _create_summary_prompt(self, meeting: Dict, context: Optional[Dict]) -> Tuple[str, Optional[Dict]]:
+        """Create the prompt for AI model, with the packing report for its context"""
         prompt = f"Meeting Summary Request:\n\n"
         prompt += f"Title: {meeting.get('title', 'No title')}\n"
         prompt += f"Date: {meeting.get('date', 'Unknown')}\n"
         prompt += f"Attendees: {', '.join(meeting.get('attendees', []))}\n\n"
         
+        report = None
         if context:
+            # Keep only the most relevant context that fits the token budget
+            query = f"{meeting.get('title', '')} {meeting.get('description', '')}"
+            context, report = self.context_packer.pack(query, {
+                'emails': context.get('emails', []),
+                'messages': context.get('messages', [])
+            })
+            
             prompt += "Related Context:\n"
-            if context.get('emails'):
-                prompt += "Emails:\n"
-                for email in context['emails']:
-                    prompt += f"- {email['subject']}\n"
-            if context.get('messages'):
-                prompt += "Messages:\n"
-                for msg in context['messages']:
-                    prompt += f"- {msg['content']}\n"
+            prompt += render_context(context) + "\n"
+        
+        return Prompt(self._prompt_prefix(), prompt), report
+    
+    def _prompt_prefix(self) -> str:
+        """
+        Get the fixed start of every summary prompt: task, instructions and output schema.
         
-        prompt += "\nPlease create a summary that includes:\n"
+        It depends only on configuration, so it is identical across meetings
+        and can be served from the provider's prompt cache.
+        """
+        prefix = "Summarise the meeting described after these instructions for its attendees.\n"
+        prefix += self._summary_instructions()
+        prefix += self._output_schema()
+        return prefix
+    
+    def _output_schema(self) -> str:
+        """Get the section layout the summary should follow"""
+        return output_schema(self.config.include_key_points, self.config.include_decisions,
+                             self.config.include_action_items)
+    
+    def _summary_instructions(self) -> str:
+        """Get the instructions listing what the summary should include"""
+        instructions = "\nPlease create a summary that includes:\n"
         if self.config.include_action_items:
-            prompt += "- Action items with responsible parties\n"
+            instructions += "- Action items with responsible parties\n"
         if self.config.include_key_points:
-            prompt += "- Key discussion points\n"
+            instructions += "- Key discussion points\n"
         if self.config.include_decisions:
-            prompt += "- Important decisions and their implications\n"
-        
-        return prompt
+            instructions += "- Important decisions and their implications\n"
+        return instructions
     
-    def _format_summary(self, summary: str) -> str:
-        """Format the summary based on configuration"""
+    def _format_parts(self) -> tuple:
+        """Get the text placed before and after the summary for the configured format"""
         if self.config.summary_format == 'markdown':
-            formatted = f"# Meeting Summary\n\n{summary}"
+            return "# Meeting Summary\n\n", ""
         elif self.config.summary_format == 'html':
-            formatted = f"<h1>Meeting Summary</h1>\n<p>{summary}</p>"
+            return "<h1>Meeting Summary</h1>\n<p>", "</p>"
         else:  # plain
-            formatted = summary
+            return "", ""
+    
+    def _format_summary(self, summary: str) -> str:
+        """Format the summary based on configuration"""
+        prefix, suffix = self._format_parts()
+        formatted = f"{prefix}{summary}{suffix}"
             
         # Truncate if too long
         if len(formatted) > self.config.max_summary_length: